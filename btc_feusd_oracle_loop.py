@@ -10,41 +10,96 @@ Usage:
     python btc_feusd_oracle_loop.py [options]
 
 Features:
-- Configurable update intervals
+- Configurable update intervals, optionally adaptive to price movement
 - Comprehensive logging
 - Error handling with exponential backoff
 - Graceful shutdown on SIGTERM/SIGINT
 - Price staleness detection
+- Optional Prometheus metrics endpoint (--metrics-port)
 - Rate limiting protection
+- Optional event-driven mode: subscribe to the feed contract's logs over
+  WebSocket (--ws-url) and only update when the on-chain price changes
 """
 
 import sys
-import os
 import time
+import asyncio
 import signal
 import logging
+import logging.handlers
 import argparse
+import atexit
+import threading
 import json
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Dict, Any, Optional
 
-# Add src to path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from src.hip3.bootstrap import MissingDependencyError, require_contract_module
+from src.hip3.oracle_common import ORACLE_HEARTBEAT_S, ORACLE_MIN_BPS, should_update
 
 try:
-    from src.hip3.hip3_update_oracle_contract import update_btc_feusd_oracle, read_btc_feusd_price
-    print("✅ Contract oracle module loaded")
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("Missing dependencies? Try: pip install web3 eth_utils")
+    _oracle = require_contract_module()
+except MissingDependencyError as e:
+    print(f"❌ Missing dependencies: {e}")
     sys.exit(1)
 
+update_btc_feusd_oracle = _oracle.update_btc_feusd_oracle
+read_btc_feusd_price = _oracle.read_btc_feusd_price
+check_price_window = _oracle.check_price_window
+invalidate_price_cache = _oracle.invalidate_price_cache
+now_chain_ts = _oracle.now_chain_ts
+deployed_coins = _oracle.deployed_coins
+oracle_log_filter = _oracle.oracle_log_filter
+WS_URL = _oracle.WS_URL
+
+# Optional faster event loop (Linux/macOS); falls back to the default asyncio loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Optional Prometheus metrics (--metrics-port); counters are no-ops when unavailable
+try:
+    from prometheus_client import Counter, Gauge, Histogram, start_http_server
+except ImportError:
+    start_http_server = None
+    UPDATES = ERRORS = CONSECUTIVE_ERRORS = UPDATE_LATENCY = None
+else:
+    UPDATES = Counter("btc_feusd_oracle_updates_total", "Oracle update attempts", ["status"])
+    ERRORS = Counter("btc_feusd_oracle_errors_total", "Failed or stale oracle updates")
+    CONSECUTIVE_ERRORS = Gauge("btc_feusd_oracle_consecutive_errors", "Current run of failed updates")
+    UPDATE_LATENCY = Histogram("btc_feusd_oracle_update_seconds", "Wall time of one oracle update")
+
+
+# Shared read-only fallback for missing price entries (never mutated)
+_EMPTY: Dict[str, Any] = {}
+
+# Exponential backoff parameters (seconds)
+BACKOFF_BASE_DELAY = 5.0
+BACKOFF_MAX_DELAY = 300.0  # 5 minutes max
+
+# How often the statistics summary is logged (seconds)
+STATS_LOG_INTERVAL = 3600
+
+# Log file rotation / buffering
+LOG_MAX_BYTES = 10 << 20  # 10 MiB per file
+LOG_BACKUP_COUNT = 5
+LOG_BUFFER_RECORDS = 100  # records held in memory before a write (ERROR+ flushes immediately)
+
+# Adaptive polling interval (--adaptive-interval)
+ADAPTIVE_QUIET_TICKS = 3  # quiet ticks in a row before the interval doubles
+ADAPTIVE_MAX_FACTOR = 10  # interval never exceeds this multiple of --interval
+EMA_ALPHA = 0.2
+
 
 class BTCFeusdOracleLoop:
     """Main class for the BTC-FEUSD oracle update loop"""
     
     def __init__(self, dex: str = "btcx", interval: int = 60, max_price_age: int = 30, 
-                 log_level: str = "INFO", log_file: Optional[str] = None):
+                 log_level: str = "INFO", log_file: Optional[str] = None,
+                 ws_url: Optional[str] = None, min_price_delta_bps: float = ORACLE_MIN_BPS,
+                 max_heartbeat: float = ORACLE_HEARTBEAT_S, metrics_port: Optional[int] = None,
+                 adaptive_interval: bool = False):
         """
         Initialize the oracle loop
         
@@ -54,34 +109,77 @@ class BTCFeusdOracleLoop:
             max_price_age: Maximum acceptable price age in minutes
             log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
             log_file: Optional log file path
+            ws_url: Optional HyperEVM WebSocket RPC URL; when set, updates are
+                    driven by feed contract logs instead of fixed-interval polling
+            min_price_delta_bps: Skip the oracle push when the price moved less than
+                                 this many basis points since the last push
+            max_heartbeat: Force a push after this many seconds even if the price
+                           has not moved past the threshold
+            metrics_port: Optional port for a Prometheus /metrics endpoint
+                          (requires prometheus_client)
+            adaptive_interval: Stretch the polling interval while the price is quiet and
+                               shrink it back on significant moves
         """
         self.dex = dex
         self.interval = interval
         self.max_price_age = max_price_age
-        self.running = True
+        self._stop = threading.Event()
         self.update_count = 0
         self.error_count = 0
-        self.last_successful_update = None
+        self.last_successful_update: Optional[float] = None  # time.monotonic()
+        self._start_mono = time.monotonic()
         self.consecutive_errors = 0
         self.max_consecutive_errors = 5
+        self._pair_key = "BTC-FEUSD"
+        # backoff for n consecutive errors, precomputed up to the stop threshold
+        self._backoff_table = [
+            min(BACKOFF_BASE_DELAY * (2 ** i), BACKOFF_MAX_DELAY)
+            for i in range(self.max_consecutive_errors + 1)
+        ]
+        self.ws_url = ws_url
+        self.min_price_delta_bps = min_price_delta_bps
+        self.max_heartbeat = max_heartbeat
+        self._last_pushed_price: Optional[float] = None
+        self._last_push_at: Optional[float] = None  # time.monotonic() of the last push
+        self._last_stats_at = self._start_mono
+        self.adaptive_interval = adaptive_interval
+        self._effective_interval = float(interval)
+        self._ema_latency: Optional[float] = None
+        self._ema_delta_bps: Optional[float] = None
+        self._quiet_ticks = 0
+        self._moved = False
+        self._last_seen_price: Optional[float] = None
         
         # Setup logging
         self._setup_logging(log_level, log_file)
+        self.logger.debug("✅ Contract oracle module loaded")
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
         
-        self.logger.info(f"🚀 BTC-FEUSD Oracle Loop initialized")
-        self.logger.info(f"   DEX: {dex}")
-        self.logger.info(f"   Update interval: {interval}s")
-        self.logger.info(f"   Max price age: {max_price_age}min")
-        self.logger.info(f"   Log level: {log_level}")
+        self.logger.info("🚀 BTC-FEUSD Oracle Loop initialized")
+        self.logger.info("   DEX: %s", dex)
+        self.logger.info("   Update interval: %ss", interval)
+        self.logger.info("   Max price age: %smin", max_price_age)
+        self.logger.info("   Log level: %s", log_level)
+        self.logger.info("   Mode: %s", "websocket subscription" if ws_url
+                         else "polling (adaptive interval)" if adaptive_interval else "polling")
+        self.logger.info("   Min price delta: %sbps (heartbeat: %ss)", min_price_delta_bps, max_heartbeat)
+        
+        # Metrics endpoint
+        if metrics_port:
+            if start_http_server is None:
+                self.logger.warning("⚠️  prometheus_client not installed, metrics disabled")
+            else:
+                start_http_server(metrics_port)
+                self.logger.info("   Metrics: http://0.0.0.0:%d/metrics", metrics_port)
     
     def _setup_logging(self, log_level: str, log_file: Optional[str]):
         """Setup logging configuration"""
         # Create logger
         self.logger = logging.getLogger('btc_feusd_oracle')
+        self._log_buffer: Optional[logging.handlers.MemoryHandler] = None
         self.logger.setLevel(getattr(logging, log_level.upper()))
         
         # Create formatter
@@ -95,164 +193,294 @@ class BTCFeusdOracleLoop:
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
         
-        # File handler (if specified)
+        # File handler (if specified): rotating file behind a memory buffer, so records
+        # are written in batches while errors still reach the disk right away
         if log_file:
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+            )
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
-            self.logger.info(f"📝 Logging to file: {log_file}")
+            self._log_buffer = logging.handlers.MemoryHandler(
+                capacity=LOG_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler
+            )
+            self.logger.addHandler(self._log_buffer)
+            atexit.register(self._flush_logs)
+            self.logger.info("📝 Logging to file: %s", log_file)
+    
+    def _flush_logs(self):
+        """Write out any buffered log records"""
+        if self._log_buffer is not None:
+            self._log_buffer.flush()
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
-        self.logger.info(f"🛑 Received signal {signum}, initiating graceful shutdown...")
-        self.running = False
+        self.logger.info("🛑 Received signal %s, initiating graceful shutdown...", signum)
+        self._flush_logs()
+        self._stop.set()
     
-    def _check_price_staleness(self, price_data: Dict[str, Any]) -> bool:
-        """Check if the current price is stale"""
-        btc_data = price_data.get("BTC-FEUSD", {})
-        
+    def _check_price_staleness(self, btc_data: Dict[str, Any]) -> bool:
+        """Check if the current price entry is stale"""
         if "error" in btc_data:
             return True
         
         age_minutes = btc_data.get('age_minutes', 999)
         return age_minutes > self.max_price_age
     
+    def _invalid_answer_reason(self, btc_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Sanity-check a contract read before spending a push on it.
+        Returns a reason string if the answer must not be used, else None.
+        """
+        if not btc_data.get('price') or btc_data['price'] <= 0:
+            return f"non-positive price ({btc_data.get('price')})"
+        updated_at = btc_data.get('updated_at') or 0
+        if updated_at <= 0:
+            return "feed has never been updated (updated_at=0)"
+        if updated_at > now_chain_ts() + 60:  # same clock as the feed age and check_price_window
+            return f"feed timestamp {updated_at} is in the future"
+        return None
+    
     def _calculate_backoff_delay(self, consecutive_errors: int) -> float:
         """Calculate exponential backoff delay"""
-        base_delay = 5.0
-        max_delay = 300.0  # 5 minutes max
-        delay = min(base_delay * (2 ** consecutive_errors), max_delay)
-        return delay
+        return self._backoff_table[min(consecutive_errors, len(self._backoff_table) - 1)]
+    
+    def _below_threshold(self, price: float) -> Optional[float]:
+        """
+        Return the move (in bps) since the last push if it is too small to be worth
+        a transaction, or None if we should push (first push, big move, or heartbeat due).
+        Same rule as every other oracle push path (oracle_common.should_update).
+        """
+        last = self._last_pushed_price
+        age_s = None if self._last_push_at is None else time.monotonic() - self._last_push_at
+        if should_update(last, price, age_s, self.min_price_delta_bps, self.max_heartbeat):
+            return None
+        return abs(price - last) / last * 10_000
+    
+    def _observe_price(self, price: float):
+        """Track tick-to-tick price movement for the adaptive interval"""
+        last = self._last_seen_price
+        self._last_seen_price = price
+        if not last:
+            return
+        delta_bps = abs(price - last) / last * 10_000
+        ema = self._ema_delta_bps
+        self._ema_delta_bps = delta_bps if ema is None else ema + EMA_ALPHA * (delta_bps - ema)
+        if delta_bps >= self.min_price_delta_bps:
+            self._moved = True
+            self._quiet_ticks = 0
+        elif self._ema_delta_bps < self.min_price_delta_bps:
+            self._quiet_ticks += 1
+    
+    def _observe_latency(self, seconds: float):
+        """Track an EMA of update wall time"""
+        ema = self._ema_latency
+        self._ema_latency = seconds if ema is None else ema + EMA_ALPHA * (seconds - ema)
+    
+    def _adaptive_interval(self) -> float:
+        """
+        Polling interval for the next wait: doubles after ADAPTIVE_QUIET_TICKS quiet ticks,
+        halves on a significant move, clamped to [interval, min(10*interval, heartbeat)]
+        and never below twice the observed update latency.
+        """
+        if not self.adaptive_interval:
+            return self.interval
+        
+        hi = max(self.interval, min(self.interval * ADAPTIVE_MAX_FACTOR, self.max_heartbeat))
+        lo = min(hi, max(self.interval, 2 * (self._ema_latency or 0.0)))
+        
+        current = self._effective_interval
+        if self._moved:
+            new = current / 2
+        elif self._quiet_ticks >= ADAPTIVE_QUIET_TICKS:
+            new = current * 2
+            self._quiet_ticks = 0
+        else:
+            new = current
+        self._moved = False
+        new = min(max(new, lo), hi)
+        
+        if new != current:
+            self.logger.info("⏱️  Polling interval %.0fs -> %.0fs (avg move %.2fbps, avg latency %.2fs)",
+                             current, new, self._ema_delta_bps or 0.0, self._ema_latency or 0.0)
+            self._effective_interval = new
+        return new
     
-    def _update_oracle(self) -> Dict[str, Any]:
+    async def _update_oracle(self) -> Dict[str, Any]:
         """Perform a single oracle update"""
+        started = time.monotonic()
         try:
-            self.logger.info(f"🔄 Starting oracle update #{self.update_count + 1}")
+            self.logger.info("🔄 Starting oracle update #%d", self.update_count + 1)
             
-            # First, check current price from contract
-            self.logger.debug("📊 Reading current BTC-FEUSD price from contract...")
-            price_data = read_btc_feusd_price(debug=False)
-            btc_data = price_data.get("BTC-FEUSD", {})
+            # Read the contract price and the DEX universe concurrently (independent RPCs)
+            self.logger.debug("Reading current BTC-FEUSD price from contract...")
+            price_data, deployed = await asyncio.gather(
+                asyncio.to_thread(read_btc_feusd_price, debug=False),
+                asyncio.to_thread(deployed_coins, self.dex),
+            )
+            btc_data = price_data.get(self._pair_key) or _EMPTY
             
             if "error" in btc_data:
                 error_msg = f"Failed to read contract price: {btc_data['error']}"
-                self.logger.error(f"❌ {error_msg}")
+                self.logger.error("❌ %s", error_msg)
                 return {"status": "error", "reason": error_msg}
             
+            # Refuse malformed answers (zero price / never-written feed) before pushing
+            invalid = self._invalid_answer_reason(btc_data)
+            if invalid:
+                self.logger.warning("⚠️  Ignoring contract answer: %s", invalid)
+                return {"status": "error", "reason": f"invalid answer: {invalid}"}
+            
             price = btc_data['price']
             age_min = btc_data['age_minutes']
+            self._observe_price(price)
             
-            self.logger.info(f"💰 Current BTC-FEUSD price: {price:,.6f} FEUSD per BTC")
-            self.logger.info(f"⏰ Price age: {age_min} minutes")
+            self.logger.info("💰 Current BTC-FEUSD price: %.6f FEUSD per BTC", price)
+            self.logger.info("⏰ Price age: %s minutes", age_min)
             
             # Check if price is stale
-            if self._check_price_staleness(price_data):
+            if self._check_price_staleness(btc_data):
                 warning_msg = f"Price is {age_min} minutes old (max: {self.max_price_age}min)"
-                self.logger.warning(f"⚠️  {warning_msg}")
+                self.logger.warning("⚠️  %s", warning_msg)
                 return {"status": "stale", "reason": warning_msg, "price": price, "age": age_min}
             
+            # Heartbeat / timestamp / median-deviation gate over this process's recent reads.
+            # A held read is not a failure: a sustained move is accepted after a few reads.
+            held = check_price_window(self._pair_key, btc_data)
+            if held:
+                self.logger.warning("⚠️  Not pushing: %s", held)
+                return {"status": "held", "reason": f"price held: {held}"}
+            
+            # Skip the transaction if the price barely moved since our last push
+            delta_bps = self._below_threshold(price)
+            if delta_bps is not None:
+                reason = f"below threshold ({delta_bps:.2f}bps < {self.min_price_delta_bps}bps)"
+                self.logger.info("ℹ️  Skipping update: %s", reason)
+                return {"status": "noop", "reason": reason}
+            
             # Update the oracle
-            self.logger.info(f"🔄 Updating oracle for DEX '{self.dex}'...")
-            result = update_btc_feusd_oracle(self.dex, debug=False)
+            self.logger.info("🔄 Updating oracle for DEX '%s'...", self.dex)
+            result = await asyncio.to_thread(
+                update_btc_feusd_oracle, self.dex, debug=False, price_info=btc_data, deployed=deployed
+            )
             
             if result["status"] == "ok":
+                self._last_pushed_price = result["price"]
+                self._last_push_at = time.monotonic()
                 self.logger.info("✅ Oracle update successful!")
-                self.logger.info(f"💰 Updated price: {result['price']:,.6f} FEUSD per BTC")
-                self.logger.info(f"📍 Mapping: {result['mapping']}")
+                self.logger.info("💰 Updated price: %.6f FEUSD per BTC", result['price'])
+                self.logger.info("📍 Mapping: %s", result['mapping'])
                 return {"status": "success", "result": result}
                 
             elif result["status"] == "noop":
-                self.logger.info(f"ℹ️  No update needed: {result['reason']}")
+                self.logger.info("ℹ️  No update needed: %s", result['reason'])
                 return {"status": "noop", "reason": result['reason']}
                 
             else:
                 error_msg = f"Oracle update failed: {result['reason']}"
-                self.logger.error(f"❌ {error_msg}")
+                self.logger.error("❌ %s", error_msg)
                 return {"status": "error", "reason": error_msg}
                 
         except Exception as e:
             error_msg = f"Unexpected error during oracle update: {e}"
-            self.logger.error(f"❌ {error_msg}")
+            self.logger.error("❌ %s", error_msg)
             return {"status": "error", "reason": error_msg}
+        finally:
+            elapsed = time.monotonic() - started
+            self._observe_latency(elapsed)
+            if UPDATE_LATENCY is not None:
+                UPDATE_LATENCY.observe(elapsed)
     
     def _log_statistics(self):
         """Log current statistics"""
-        uptime = datetime.now() - self.start_time
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        now = time.monotonic()
+        uptime = timedelta(seconds=int(now - self._start_mono))
         success_rate = (self.update_count - self.error_count) / max(self.update_count, 1) * 100
         
-        self.logger.info("📊 Statistics:")
-        self.logger.info(f"   Uptime: {uptime}")
-        self.logger.info(f"   Total updates: {self.update_count}")
-        self.logger.info(f"   Errors: {self.error_count}")
-        self.logger.info(f"   Success rate: {success_rate:.1f}%")
-        self.logger.info(f"   Consecutive errors: {self.consecutive_errors}")
+        self.logger.info("Statistics:")
+        self.logger.info("   Uptime: %s", uptime)
+        self.logger.info("   Total updates: %d", self.update_count)
+        self.logger.info("   Errors: %d", self.error_count)
+        self.logger.info("   Success rate: %.1f%%", success_rate)
+        self.logger.info("   Consecutive errors: %d", self.consecutive_errors)
         
         if self.last_successful_update:
-            time_since_success = datetime.now() - self.last_successful_update
-            self.logger.info(f"   Last successful update: {time_since_success} ago")
+            time_since_success = timedelta(seconds=int(now - self.last_successful_update))
+            self.logger.info("   Last successful update: %s ago", time_since_success)
     
-    def run(self):
-        """Main loop"""
-        self.start_time = datetime.now()
-        self.logger.info("🎯 Starting BTC-FEUSD Oracle Loop")
-        self.logger.info("=" * 60)
+    def _handle_result(self, result: Dict[str, Any]) -> bool:
+        """Update counters for one oracle update result; returns False if the loop should stop"""
+        self.update_count += 1
+        status = result["status"]
         
-        while self.running:
+        if status == "success":
+            self.consecutive_errors = 0
+            self.last_successful_update = time.monotonic()
+            self.logger.info("✅ Update completed successfully")
+            
+        elif status == "noop":
+            self.consecutive_errors = 0
+            self.logger.info("ℹ️  No update needed")
+            
+        elif status == "held":
+            # Neither a success nor a failure: leave consecutive_errors as it is
+            self.logger.info("ℹ️  Update held: %s", result['reason'])
+            
+        elif status == "stale":
+            self.consecutive_errors += 1
+            self.error_count += 1
+            self.logger.warning("⚠️  Price is stale, will retry")
+            
+        else:  # error
+            self.consecutive_errors += 1
+            self.error_count += 1
+            self.logger.error("❌ Update failed: %s", result['reason'])
+        
+        if UPDATES is not None:
+            UPDATES.labels(status=status).inc()
+            if status in ("stale", "error"):
+                ERRORS.inc()
+            CONSECUTIVE_ERRORS.set(self.consecutive_errors)
+        
+        # Check for too many consecutive errors
+        if self.consecutive_errors >= self.max_consecutive_errors:
+            self.logger.error("🚨 Too many consecutive errors (%d), stopping loop", self.consecutive_errors)
+            return False
+        
+        # Periodic summary; per-update counters are exported via --metrics-port
+        now = time.monotonic()
+        if now - self._last_stats_at >= STATS_LOG_INTERVAL:
+            self._last_stats_at = now
+            self._log_statistics()
+        
+        return True
+    
+    async def _wait_for_stop(self, timeout: float) -> bool:
+        """Sleep up to `timeout` seconds off the event loop; True if a shutdown was requested"""
+        return await asyncio.to_thread(self._stop.wait, timeout)
+    
+    async def _run_polling(self):
+        """Fixed-interval polling loop"""
+        while not self._stop.is_set():
             try:
                 # Perform oracle update
-                result = self._update_oracle()
-                self.update_count += 1
-                
-                # Handle result
-                if result["status"] == "success":
-                    self.consecutive_errors = 0
-                    self.last_successful_update = datetime.now()
-                    self.logger.info("✅ Update completed successfully")
-                    
-                elif result["status"] == "noop":
-                    self.consecutive_errors = 0
-                    self.logger.info("ℹ️  No update needed")
-                    
-                elif result["status"] == "stale":
-                    self.consecutive_errors += 1
-                    self.error_count += 1
-                    self.logger.warning(f"⚠️  Price is stale, will retry")
-                    
-                else:  # error
-                    self.consecutive_errors += 1
-                    self.error_count += 1
-                    self.logger.error(f"❌ Update failed: {result['reason']}")
-                
-                # Check for too many consecutive errors
-                if self.consecutive_errors >= self.max_consecutive_errors:
-                    self.logger.error(f"🚨 Too many consecutive errors ({self.consecutive_errors}), stopping loop")
+                result = await self._update_oracle()
+                if not self._handle_result(result):
                     break
                 
-                # Log statistics every 10 updates
-                if self.update_count % 10 == 0:
-                    self._log_statistics()
-                
-                # Wait for next update
-                if self.running:
-                    self.logger.debug(f"⏳ Waiting {self.interval} seconds until next update...")
-                    
-                    # Sleep in small chunks to allow for graceful shutdown
-                    sleep_chunks = self.interval // 5
-                    for _ in range(sleep_chunks):
-                        if not self.running:
-                            break
-                        time.sleep(5)
-                    
-                    # Sleep remaining time
-                    remaining = self.interval % 5
-                    if remaining > 0 and self.running:
-                        time.sleep(remaining)
+                # Wait for next update; returns immediately once a shutdown signal sets the event
+                interval = self._adaptive_interval()
+                self.logger.debug("Waiting %.0f seconds until next update...", interval)
+                if await self._wait_for_stop(interval):
+                    break
                 
             except KeyboardInterrupt:
                 self.logger.info("🛑 Keyboard interrupt received")
                 break
             except Exception as e:
-                self.logger.error(f"💥 Unexpected error in main loop: {e}")
+                self.logger.error("💥 Unexpected error in main loop: %s", e)
                 self.consecutive_errors += 1
                 self.error_count += 1
                 
@@ -262,13 +490,109 @@ class BTCFeusdOracleLoop:
                 
                 # Exponential backoff on errors
                 backoff_delay = self._calculate_backoff_delay(self.consecutive_errors)
-                self.logger.info(f"⏳ Backing off for {backoff_delay:.1f} seconds...")
-                time.sleep(backoff_delay)
+                self.logger.info("⏳ Backing off for %.1f seconds...", backoff_delay)
+                if await self._wait_for_stop(backoff_delay):
+                    break
+    
+    def _request_stop_async(self, signum: int):
+        """Signal handler for the asyncio loop: stop and wake the waiting coroutine"""
+        self._signal_handler(signum, None)
+        self._wake.put_nowait(None)
+    
+    async def _pump_logs(self, w3):
+        """Forward every subscription notification to the wake queue"""
+        try:
+            async for message in w3.socket.process_subscriptions():
+                self._wake.put_nowait(message)
+        finally:
+            # Wake the main coroutine so it notices the subscription is gone
+            self._wake.put_nowait(None)
+    
+    async def _run_subscribed(self):
+        """
+        Event-driven loop: wake on feed contract logs (eth_subscribe 'logs'),
+        with a max_price_age watchdog that forces an update if nothing arrives.
+        """
+        from web3 import AsyncWeb3, WebSocketProvider
+        
+        loop = asyncio.get_running_loop()
+        self._wake: asyncio.Queue = asyncio.Queue()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self._request_stop_async, sig)
+        
+        watchdog = self.max_price_age * 60
+        
+        while not self._stop.is_set():
+            try:
+                async with AsyncWeb3(WebSocketProvider(self.ws_url)) as w3:
+                    sub_id = await w3.eth.subscribe("logs", oracle_log_filter())
+                    self.logger.info("📡 Subscribed to feed logs (subscription %s)", sub_id)
+                    pump = asyncio.create_task(self._pump_logs(w3))
+                    try:
+                        # Push once on (re)connect, then only on change or watchdog expiry
+                        keep_going = self._handle_result(await self._update_oracle())
+                        while keep_going and not self._stop.is_set():
+                            try:
+                                event = await asyncio.wait_for(self._wake.get(), timeout=watchdog)
+                            except asyncio.TimeoutError:
+                                self.logger.info("⏰ No feed update for %smin, forcing oracle update", self.max_price_age)
+                                event = "watchdog"
+                            if self._stop.is_set():
+                                break
+                            if pump.done():
+                                raise RuntimeError(f"log subscription ended: {pump.exception()}")
+                            # Coalesce a burst of logs into a single update
+                            while not self._wake.empty():
+                                self._wake.get_nowait()
+                            self.logger.debug("Woken by %s", "watchdog" if event == "watchdog" else "feed log")
+                            if event != "watchdog":
+                                # The log means a new feed write: don't let the read cache serve the old one
+                                invalidate_price_cache(self._pair_key)
+                            keep_going = self._handle_result(await self._update_oracle())
+                        if not keep_going:
+                            break
+                    finally:
+                        pump.cancel()
+                        
+            except Exception as e:
+                self.logger.error("💥 WebSocket loop error: %s", e)
+                self.consecutive_errors += 1
+                self.error_count += 1
+                
+                if self.consecutive_errors >= self.max_consecutive_errors:
+                    self.logger.error("🚨 Too many consecutive errors, stopping loop")
+                    break
+                
+                backoff_delay = self._calculate_backoff_delay(self.consecutive_errors)
+                self.logger.info("⏳ Reconnecting in %.1f seconds...", backoff_delay)
+                try:
+                    await asyncio.wait_for(self._wake.get(), timeout=backoff_delay)
+                except asyncio.TimeoutError:
+                    pass
+    
+    async def _async_main(self):
+        """Dispatch to the subscription or polling loop"""
+        if self.ws_url:
+            await self._run_subscribed()
+        else:
+            await self._run_polling()
+    
+    def run(self):
+        """Main loop"""
+        self._start_mono = time.monotonic()
+        self.logger.info("🎯 Starting BTC-FEUSD Oracle Loop")
+        self.logger.info("=" * 60)
+        
+        if uvloop is not None and sys.platform != "win32":
+            self.logger.debug("Using uvloop event loop")
+            uvloop.install()
+        asyncio.run(self._async_main())
         
         # Final statistics
         self.logger.info("🏁 Oracle loop stopped")
         self._log_statistics()
         self.logger.info("=" * 60)
+        self._flush_logs()
 
 
 def main():
@@ -284,6 +608,9 @@ Examples:
   # Custom interval and DEX
   python btc_feusd_oracle_loop.py --dex btcx --interval 30
   
+  # Event-driven: update when the feed contract emits a log
+  python btc_feusd_oracle_loop.py --ws-url wss://<hyperevm-rpc>
+  
   # With logging to file
   python btc_feusd_oracle_loop.py --log-file oracle.log --log-level DEBUG
   
@@ -312,6 +639,20 @@ Examples:
         help='Maximum acceptable price age in minutes (default: 30)'
     )
     
+    parser.add_argument(
+        '--min-price-delta-bps',
+        type=float,
+        default=ORACLE_MIN_BPS,
+        help=f'Skip the push if the price moved less than this many bps since the last one (default: {ORACLE_MIN_BPS:g})'
+    )
+    
+    parser.add_argument(
+        '--max-heartbeat',
+        type=int,
+        default=int(ORACLE_HEARTBEAT_S),
+        help=f'Force a push after this many seconds regardless of price movement (default: {ORACLE_HEARTBEAT_S:.0f})'
+    )
+    
     parser.add_argument(
         '--log-level', 
         choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
@@ -324,6 +665,26 @@ Examples:
         help='Log file path (optional)'
     )
     
+    parser.add_argument(
+        '--ws-url',
+        default=WS_URL or None,
+        help='HyperEVM WebSocket RPC URL; subscribe to feed logs instead of polling '
+             '(default: $HYPEREVM_WS_URL, polling if unset)'
+    )
+    
+    parser.add_argument(
+        '--adaptive-interval',
+        action='store_true',
+        help='Stretch the polling interval (up to 10x, capped by --max-heartbeat) while the '
+             'price is quiet and shrink it on significant moves'
+    )
+    
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        help='Expose Prometheus metrics on this port (optional, needs prometheus_client)'
+    )
+    
     parser.add_argument(
         '--version', 
         action='version', 
@@ -341,6 +702,10 @@ Examples:
         print("❌ Error: Max price age must be at least 5 minutes")
         sys.exit(1)
     
+    if args.min_price_delta_bps < 0:
+        print("❌ Error: Min price delta must not be negative")
+        sys.exit(1)
+    
     # Create and run the oracle loop
     try:
         oracle_loop = BTCFeusdOracleLoop(
@@ -348,7 +713,12 @@ Examples:
             interval=args.interval,
             max_price_age=args.max_price_age,
             log_level=args.log_level,
-            log_file=args.log_file
+            log_file=args.log_file,
+            ws_url=args.ws_url,
+            min_price_delta_bps=args.min_price_delta_bps,
+            max_heartbeat=args.max_heartbeat,
+            metrics_port=args.metrics_port,
+            adaptive_interval=args.adaptive_interval
         )
         
         oracle_loop.run()
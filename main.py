@@ -5,19 +5,19 @@ main.py
 Example executable script to fetch token IDs from Hyperliquid.
 """
 
-import json
-from hyperliquid.info import Info
 from src.prices.redstone_prices import fetch_redstone_prices
 from src.prices.hl_spot_prices import get_spot_mid, get_stable_usd_factors, debug_spot_catalog
 from src.prices.hl_spot_prices import list_spot_pairs_for_token, get_spot_mid_any
 from src.hip3.token_ids import get_api_url, build_token_index_map, resolve_tokens
 from src.compute.stable_fx import resolve_stable_usd_factor_with_usdc_reference
-import src.hl_utils.example_utils as example_utils
+from src.hl_utils.clients import get_clients, get_info
+from src.hl_utils.json_utils import dumps_pretty, print_json
 from src.hip3.hip3_config import DEX_SPECS, API_URL
-from src.hip3.hip3_deploy import get_collateral_index, register_first_asset_and_create_dex, register_extra_assets, deploy_missing_assets_only
-from src.hip3.hip3_update_oracle import update_oracle_for_dex
+from src.hip3.hip3_deploy import deploy_dexes, deploy_missing_assets_only
+from src.hip3.hip3_update_oracle import update_oracle_for_dex, update_oracle_for_dexes
 from src.hip3.get_dex_info import get_info_dex
-import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 
 def main_token_ids():
@@ -28,7 +28,7 @@ def main_token_ids():
 
     # Connect to API
     api_url = get_api_url(network)
-    info = Info(api_url, skip_ws=True)
+    info = get_info(api_url)
 
     # Build token map
     token_map = build_token_index_map(info)
@@ -44,7 +44,7 @@ def main_token_ids():
         "not_found": not_found,
     }
 
-    print(json.dumps(result, indent=2))
+    print_json(result)
 
 def main_redstone_prices():
     symbols = ["BTC", "ETH", "feUSD", "USDHL", "USDT0", "USDC"]
@@ -53,15 +53,15 @@ def main_redstone_prices():
             symbols,
         )
     except Exception as e:
-        print(json.dumps({"ok": False, "error": str(e)}))
+        print_json({"ok": False, "error": str(e)}, indent=False)
         return
 
-    print(json.dumps({"ok": True, "prices": prices} , indent=2))
+    print_json({"ok": True, "prices": prices})
 
 def main_debug_spot_pairs(network: str = "mainnet"):
     
     api_url = get_api_url(network)
-    info = Info(api_url, skip_ws=True)
+    info = get_info(api_url)
 
     tokens = ["FEUSD", "USDHL", "USDT0"]  # respect the exact casing you saw in TOKENS
     out = {"network": network, "pairs_by_token": {}, "sample_fx": {}}
@@ -74,17 +74,19 @@ def main_debug_spot_pairs(network: str = "mainnet"):
         ]
 
     # Try to get a usable USD factor for FEUSD and USDHL using USDT0 first, then the other stable
+    # (one allMids snapshot shared by both lookups)
+    mids = info.all_mids()
     try:
-        out["sample_fx"]["FEUSD_vs_USD_like"] = get_spot_mid_any(info, "FEUSD", ["USDT0", "USDHL"])
+        out["sample_fx"]["FEUSD_vs_USD_like"] = get_spot_mid_any(info, "FEUSD", ["USDT0", "USDHL"], mids=mids)
     except Exception as e:
         out["sample_fx"]["FEUSD_vs_USD_like_error"] = str(e)
 
     try:
-        out["sample_fx"]["USDHL_vs_USD_like"] = get_spot_mid_any(info, "USDHL", ["USDT0", "FEUSD"])
+        out["sample_fx"]["USDHL_vs_USD_like"] = get_spot_mid_any(info, "USDHL", ["USDT0", "FEUSD"], mids=mids)
     except Exception as e:
         out["sample_fx"]["USDHL_vs_USD_like_error"] = str(e)
 
-    print(json.dumps(out, indent=2))
+    print_json(out)
 
 
 def main_hl_stables(network: str = "mainnet"):
@@ -93,7 +95,7 @@ def main_hl_stables(network: str = "mainnet"):
     and a dict of USD factors for each stable.
     """
     api_url = get_api_url(network)
-    info = Info(api_url, skip_ws=True)
+    info = get_info(api_url)
     debug_spot_catalog(info, limit=10000)
     out = {"network": network, "api_url": api_url, "pairs": {}, "usd_factors": {}}
 
@@ -114,7 +116,7 @@ def main_hl_stables(network: str = "mainnet"):
     except Exception as e:
         out["usd_factors_error"] = str(e)
 
-    print(json.dumps(out, indent=2))
+    print_json(out)
 
 def main_build_btc_quotes_for_dexes():
     """
@@ -140,11 +142,15 @@ def main_build_btc_quotes_for_dexes():
     btc_usd = float(rs["BTC"]["value"])
     usdc_usd = float(rs["USDC"]["value"])
 
-    # 2) Resolve stables vs USD using proper USDC reference
-    info = Info(get_api_url("mainnet"), skip_ws=True)
-    fx_feusd  = resolve_stable_usd_factor_with_usdc_reference(info, "FEUSD", usdc_usd, evm_addresses=EVM_ADDR, evm_usd_reference="USDC")
-    fx_usdhl  = resolve_stable_usd_factor_with_usdc_reference(info, "USDHL", usdc_usd, evm_addresses=EVM_ADDR, evm_usd_reference="USDC")
-    fx_usdt0  = resolve_stable_usd_factor_with_usdc_reference(info, "USDT0", usdc_usd, evm_addresses=EVM_ADDR, evm_usd_reference="USDC")
+    # 2) Resolve stables vs USD using proper USDC reference (independent lookups, run concurrently)
+    info = get_info(get_api_url("mainnet"))
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        fx_feusd, fx_usdhl, fx_usdt0 = ex.map(
+            lambda sym: resolve_stable_usd_factor_with_usdc_reference(
+                info, sym, usdc_usd, evm_addresses=EVM_ADDR, evm_usd_reference="USDC"
+            ),
+            ["FEUSD", "USDHL", "USDT0"],
+        )
 
     # 3) Convert BTC/USD -> BTC/<stable>
     # BTC/X = (BTC/USD) / (X/USD)
@@ -163,27 +169,23 @@ def main_build_btc_quotes_for_dexes():
         }
     }
 
-    print(json.dumps(out, indent=2))
+    print_json(out)
 
 
 def main_hip3_deploy():
-        # 0) Wallet + connections (via example_utils from HL examples)
-    address, info, exchange = example_utils.setup(API_URL, skip_ws=True)
+        # 0) Wallet + connections (shared process-wide, via example_utils from HL examples)
+    address, info, exchange = get_clients(API_URL)
     print("perp deploy auction:", info.query_perp_deploy_auction_status())
 
-    # 1) Deploy each DEX
-    for spec in DEX_SPECS:
-        print(f"\n=== Deploy DEX {spec['dex']} (collateral={spec['collateral_symbol']}) ===")
-        coll_index = get_collateral_index(info, spec["collateral_symbol"])
-        res1 = register_first_asset_and_create_dex(exchange, address, spec, coll_index)
-        print("[create dex + register 1st asset] ->", res1)
-        time.sleep(1)
-
-        register_extra_assets(exchange, spec)
+    # 1) Deploy every DEX (lookups overlap; register calls are serialized on the wallet)
+    results = asyncio.run(deploy_dexes(exchange, address, info, DEX_SPECS))
 
-        # 2) Inspect meta
-        meta = info.meta(dex=spec["dex"])
-        print("[meta]", spec["dex"], "->", json.dumps(meta, indent=2))
+    # 2) Inspect meta
+    for spec, res in zip(DEX_SPECS, results):
+        if isinstance(res, Exception):
+            print("[deploy failed]", spec["dex"], "->", res)
+            continue
+        print("[meta]", spec["dex"], "->", dumps_pretty(res["meta"]))
 
     print("\nAll done.")
 
@@ -191,13 +193,19 @@ def main_oracle_update():
     result = update_oracle_for_dex("btcx", strict=False, debug=True)
     print("Oracle update result:", result["status"], "coins:", result["pushed_coins"])
 
+def main_oracle_update_all():
+    """Push oracle prices for every DEX in DEX_SPECS with one shared client setup."""
+    results = update_oracle_for_dexes(debug=True)
+    for dex, result in results.items():
+        print(f"Oracle update result [{dex}]:", result["status"], "coins:", result["pushed_coins"])
+
 def main_deploy_missing_assets():
     """Deploy only missing assets for existing DEXes."""
     deploy_missing_assets_only()
 
 def main_get_dex_info():
     meta = get_info_dex("btcx")
-    print(json.dumps(meta, indent=2))
+    print_json(meta)
 
 if __name__ == "__main__":
     main_get_dex_info()
@@ -7,142 +7,145 @@ This will place both buy and sell orders to create liquidity.
 Enhanced with loop and random spreads for better market simulation.
 """
 
-import json
-import time
+import functools
+import math
 import random
-import requests
-from decimal import Decimal, ROUND_DOWN
-from hyperliquid.utils import constants
-from src.hl_utils.example_utils import setup
+from src.hl_utils.clients import get_clients
 from src.hip3.hip3_config import DEX_SPECS, API_URL
-from src.hl_utils.order_book_utils import get_order_book_levels, check_order_book_liquidity
+from src.hl_utils.order_book_utils import get_order_book_levels, check_order_book_liquidity, wait_for_two_sided_book
+from src.hip3.hip3_deploy import get_universe_index
+from src.hl_utils.json_utils import dumps_pretty
 
 DUMMY_DEX = "btcx"
 COIN = f"{DUMMY_DEX}:BTC-FEUSD"
 BASE_COIN = "BTC-FEUSD"  # Without DEX prefix for SDK calls
+BOOK_WAIT_TIMEOUT = 10.0  # seconds to wait for seeded orders to show up on the book
 
-def fmt(val: Decimal, decs: int) -> str:
-    """Format decimal to string with specified decimal places."""
-    q = Decimal(10) ** -decs
-    return str(val.quantize(q, rounding=ROUND_DOWN))
+def fmt_float(val: float, decs: int) -> str:
+    """Format a float to string with `decs` decimal places, truncated toward zero."""
+    scale = 10 ** decs
+    # round() first so binary noise (0.29 * 100 == 28.999...) doesn't drop a whole unit
+    return f"{math.trunc(round(val * scale, 6)) / scale:.{decs}f}"
+
+@functools.lru_cache(maxsize=1024)
+def format_size(size: float, decs: int) -> str:
+    """Format size with correct decimal places (sizes come from a handful of values, so memoized)."""
+    return fmt_float(size, decs)
 
 def get_market_meta(info, dex: str, coin: str):
     """Get market metadata for a specific coin."""
-    meta = info.meta(dex=dex)
-    universe = meta.get("universe", [])
+    meta, index = get_universe_index(info, dex)
     name = f"{dex}:{coin}"
     
-    for i, asset in enumerate(universe):
-        if asset.get("name") == name:
-            return meta, asset, i
+    hit = index.get(name)
+    if hit is not None:
+        return meta, hit[0], hit[1]
     
     raise RuntimeError(f"Market {name} not found in {dex} universe.")
 
+def _draw_seed_quotes(reference_price: float, n: int):
+    """
+    Draw all n iterations at once; returns column lists
+    (spreads, sizes, mids, bids, asks) indexed by iteration.
+    Draws are integer ticks and prices integer cents, so no round() is needed.
+    """
+    randrange = random.randrange
+    ref_cents = round(reference_price * 100)
+    spreads, sizes, mids, bids, asks = [], [], [], [], []
+    # One fused pass: each mid / spread feeds both sides
+    for _ in range(n):
+        spread_bp = randrange(50, 501)       # random spread between 0.5% and 5% (basis points)
+        var_bp = randrange(-200, 201)        # some price variation (±2% around reference)
+        mid_cents = ref_cents * (10_000 + var_bp) // 10_000
+        spreads.append(spread_bp / 10_000)
+        # Random order size between 0.001 and 0.005 (3 decimal places)
+        sizes.append(randrange(1, 6) / 1000)
+        mids.append(mid_cents / 100)
+        # Bid rounds down, ask rounds up, both on whole cents
+        bids.append(mid_cents * (20_000 - spread_bp) // 20_000 / 100)
+        asks.append(-(-mid_cents * (20_000 + spread_bp) // 20_000) / 100)
+    return spreads, sizes, mids, bids, asks
+
+def _bulk_statuses(resp) -> list:
+    """Per-order statuses from a bulk_orders response ([] if the whole batch was rejected)."""
+    if not isinstance(resp, dict) or resp.get("status") != "ok":
+        return []
+    data = (resp.get("response") or {}).get("data") or {}
+    return data.get("statuses") or []
+
 def place_seed_orders_loop(exchange, info, reference_price: float = 117000.0, num_iterations: int = 5):
-    """Place multiple rounds of buy and sell orders with random spreads."""
+    """Place multiple rounds of buy and sell orders with random spreads in one bulk request."""
     print(f"=== Seeding Order Book for {COIN} with {num_iterations} iterations ===")
     
     # Get market metadata
     try:
         meta, market_asset, asset_idx = get_market_meta(info, DUMMY_DEX, "BTC-FEUSD")
         sz_decimals = market_asset.get("szDecimals", 3)
-        print(f"Market asset: {json.dumps(market_asset, indent=2)}")
+        print(f"Market asset: {dumps_pretty(market_asset)}")
         print(f"Size decimals: {sz_decimals}")
         print(f"Asset index: {asset_idx}")
     except Exception as e:
         print(f"Error getting market meta: {e}")
         return False
     
-    def format_size(size: float) -> str:
-        """Format size with correct decimal places."""
-        return fmt(Decimal(str(size)), sz_decimals)
-    
     print(f"Reference price: {reference_price}")
     
-    successful_orders = 0
-    total_orders = 0
+    # Draw every iteration's quote up front; all bid/ask orders go out in one signed action.
+    # Output is collected and printed in one write per phase, not per order.
+    records = []  # (iteration, side, price, size)
+    orders = []
+    plan = []
+    draws = zip(*_draw_seed_quotes(reference_price, num_iterations))
+    for iteration, (spread_percent, order_size, current_price, bid_price, ask_price) in enumerate(draws, 1):
+        plan.append(
+            f"\n--- Iteration {iteration}/{num_iterations} ---\n"
+            f"Spread: {spread_percent*100:.2f}%, Size: {format_size(order_size, sz_decimals)}\n"
+            f"Current price: {current_price:.2f}\n"
+            f"Bid price: {bid_price}, Ask price: {ask_price}"
+        )
+        for side, is_buy, px in (("BID", True, bid_price), ("ASK", False, ask_price)):
+            records.append((iteration, side, px, order_size))
+            orders.append({
+                "coin": COIN,
+                "is_buy": is_buy,
+                "sz": order_size,
+                "limit_px": px,
+                "order_type": {"limit": {"tif": "Gtc"}},  # Good till cancel
+                "reduce_only": False,
+            })
+    
+    total_orders = len(orders)
+    plan.append(f"\nSubmitting {total_orders} orders in one bulk request...")
+    print("\n".join(plan))
     
-    for iteration in range(num_iterations):
-        print(f"\n--- Iteration {iteration + 1}/{num_iterations} ---")
-        
-        # Generate random spread between 0.5% and 5%
-        spread_percent = random.uniform(0.005, 0.05)
-        
-        # Generate random order size between 0.001 and 0.005
-        order_size = random.uniform(0.001, 0.005)
-        order_size = round(order_size, 3)  # Round to 3 decimal places
-        
-        # Add some price variation (±2% around reference)
-        price_variation = random.uniform(-0.02, 0.02)
-        current_price = reference_price * (1 + price_variation)
-        
-        bid_price = current_price * (1 - spread_percent / 2)
-        ask_price = current_price * (1 + spread_percent / 2)
-        
-        # Round prices to 2 decimal places
-        bid_price = round(bid_price, 2)
-        ask_price = round(ask_price, 2)
-        
-        print(f"Spread: {spread_percent*100:.2f}%, Size: {order_size}")
-        print(f"Current price: {current_price:.2f}")
-        print(f"Bid price: {bid_price}, Ask price: {ask_price}")
-        
-        # Place orders using the same method that works
-        try:
-            # Place buy order (bid)
-            print(f"Placing BID: {order_size} @ {bid_price}")
-            bid_resp = exchange.order(
-                COIN, 
-                True,  # is_buy
-                order_size, 
-                bid_price, 
-                {"limit": {"tif": "Gtc"}},  # Good till cancel
-            )
-            total_orders += 1
-            if bid_resp.get("status") == "ok":
-                print(f"✓ BID placed successfully")
-                successful_orders += 1
-            else:
-                print(f"✗ BID failed: {bid_resp}")
-                
-        except Exception as e:
-            print(f"✗ BID failed with error: {e}")
-            total_orders += 1
-        
-        # Wait between bid and askAPI_URL=http://localhost:8000
-        time.sleep(2)
-        
-        try:
-            # Place sell order (ask)
-            print(f"Placing ASK: {order_size} @ {ask_price}")
-            ask_resp = exchange.order(
-                COIN, 
-                False,  # is_buy
-                order_size, 
-                ask_price, 
-                {"limit": {"tif": "Gtc"}},  # Good till cancel
-            )
-            total_orders += 1
-            if ask_resp.get("status") == "ok":
-                print(f"✓ ASK placed successfully")
-                successful_orders += 1
-            else:
-                print(f"✗ ASK failed: {ask_resp}")
-                
-        except Exception as e:
-            print(f"✗ ASK failed with error: {e}")
-            total_orders += 1
-        
-        # Wait between iterations
-        if iteration < num_iterations - 1:
-            wait_time = random.uniform(3, 6)
-            print(f"Waiting {wait_time:.1f} seconds before next iteration...")
-            time.sleep(wait_time)
+    try:
+        # One signed POST; the exchange's session is the shared keep-alive pool
+        # (http_session), so this reuses the connection opened during setup.
+        resp = exchange.bulk_orders(orders)
+    except Exception as e:
+        print(f"✗ Bulk order failed with error: {e}")
+        resp = None
     
-    print(f"\n=== Order Placement Summary ===")
-    print(f"Total orders attempted: {total_orders}")
-    print(f"Successful orders: {successful_orders}")
-    print(f"Success rate: {(successful_orders/total_orders)*100:.1f}%")
+    statuses = _bulk_statuses(resp)
+    if resp is not None and not statuses:
+        print(f"✗ Bulk order rejected: {resp}")
+    
+    successful_orders = 0
+    report = []
+    for (iteration, side, px, sz), st in zip(records, statuses):
+        if isinstance(st, dict) and "error" not in st:
+            report.append(f"✓ {side} #{iteration} {format_size(sz, sz_decimals)} @ {px} placed successfully")
+            successful_orders += 1
+        else:
+            report.append(f"✗ {side} #{iteration} {format_size(sz, sz_decimals)} @ {px} failed: {st}")
+    
+    report.append(
+        f"\n=== Order Placement Summary ===\n"
+        f"Total orders attempted: {total_orders}\n"
+        f"Successful orders: {successful_orders}\n"
+        f"Success rate: {(successful_orders/max(total_orders, 1))*100:.1f}%"
+    )
+    print("\n".join(report))
     
     return successful_orders > 0
 
@@ -154,17 +157,13 @@ def place_seed_orders(exchange, info, reference_price: float = 117000.0):
     try:
         meta, market_asset, asset_idx = get_market_meta(info, DUMMY_DEX, "BTC-FEUSD")
         sz_decimals = market_asset.get("szDecimals", 3)
-        print(f"Market asset: {json.dumps(market_asset, indent=2)}")
+        print(f"Market asset: {dumps_pretty(market_asset)}")
         print(f"Size decimals: {sz_decimals}")
         print(f"Asset index: {asset_idx}")
     except Exception as e:
         print(f"Error getting market meta: {e}")
         return False
     
-    def format_size(size: float) -> str:
-        """Format size with correct decimal places."""
-        return fmt(Decimal(str(size)), sz_decimals)
-    
     # Define order parameters
     order_size = 0.001  # Small size for testing
     spread_percent = 0.02  # 2% spread
@@ -177,101 +176,45 @@ def place_seed_orders(exchange, info, reference_price: float = 117000.0):
     print(f"Ask price: {ask_price}")
     print(f"Order size: {order_size}")
     
-    orders_placed = []
+    # Bid and ask are independent, so send them as one signed action:
+    # one nonce, one round trip instead of two sequential exchange.order calls.
+    orders = [
+        {
+            "coin": COIN,
+            "is_buy": is_buy,
+            "sz": order_size,
+            "limit_px": px,
+            "order_type": {"limit": {"tif": "Gtc"}},  # Good till cancel
+            "reduce_only": False,
+        }
+        for is_buy, px in ((True, bid_price), (False, ask_price))
+    ]
     
-    # Method 1: Try SDK order helper with dex parameter
     try:
-        print("\nTrying SDK order helper with dex parameter...")
-        
-        # Place buy order (bid)
-        bid_resp = exchange.order(
-            COIN, 
-            True,  # is_buy
-            order_size, 
-            bid_price, 
-            {"limit": {"tif": "Gtc"}},  # Good till cancel
-        )
-        print(f"BID order result: {json.dumps(bid_resp, indent=2)}")
-        orders_placed.append(("BID", bid_resp))
-        
-        # Place sell order (ask)
-        ask_resp = exchange.order(
-            COIN, 
-            False,  # is_buy
-            order_size, 
-            ask_price, 
-            {"limit": {"tif": "Gtc"}},  # Good till cancel
-        )
-        print(f"ASK order result: {json.dumps(ask_resp, indent=2)}")
-        orders_placed.append(("ASK", ask_resp))
-        
-        return True
-        
+        print("\nPlacing bid + ask in one bulk request...")
+        resp = exchange.bulk_orders(orders)
+        print(f"Bulk order result: {dumps_pretty(resp)}")
     except TypeError as e:
-        print(f"dex parameter not supported: {e}")
+        print(f"SDK order helper rejected the arguments: {e}")
+        return False
     except Exception as e:
-        print(f"SDK order helper failed: {e}")
+        print(f"SDK order method failed: {e}")
+        return False
     
-    # Method 2: Try SDK order helper without dex parameter
-    try:
-        print("\nTrying SDK order helper without dex parameter...")
-        
-        bid_resp = exchange.order(
-            COIN, 
-            True, 
-            order_size, 
-            bid_price, 
-            {"limit": {"tif": "Gtc"}}
-        )
-        print(f"BID order result: {json.dumps(bid_resp, indent=2)}")
-        orders_placed.append(("BID", bid_resp))
-        
-        ask_resp = exchange.order(
-            COIN, 
-            False, 
-            order_size, 
-            ask_price, 
-            {"limit": {"tif": "Gtc"}}
-        )
-        print(f"ASK order result: {json.dumps(ask_resp, indent=2)}")
-        orders_placed.append(("ASK", ask_resp))
-        
-        return True
-        
-    except Exception as e:
-        print(f"SDK order helper without dex failed: {e}")
+    statuses = _bulk_statuses(resp)
+    if not statuses:
+        print(f"✗ Bulk order rejected: {resp}")
+        return False
     
-    # Method 3: Use the working SDK method but with proper error handling
-    print("\nUsing working SDK method with proper error handling...")
+    placed = 0
+    for side, st in zip(("BID", "ASK"), statuses):
+        if isinstance(st, dict) and "error" not in st:
+            print(f"✓ {side} order placed: {st}")
+            placed += 1
+        else:
+            print(f"✗ {side} order failed: {st}")
     
-    try:
-        # Place buy order (bid) - this worked before
-        bid_resp = exchange.order(
-            COIN, 
-            True,  # is_buy
-            order_size, 
-            bid_price, 
-            {"limit": {"tif": "Gtc"}},  # Good till cancel
-        )
-        print(f"BID order result: {json.dumps(bid_resp, indent=2)}")
-        orders_placed.append(("BID", bid_resp))
-        
-        # Place sell order (ask) - use the same method
-        ask_resp = exchange.order(
-            COIN, 
-            False,  # is_buy
-            order_size, 
-            ask_price, 
-            {"limit": {"tif": "Gtc"}},  # Good till cancel
-        )
-        print(f"ASK order result: {json.dumps(ask_resp, indent=2)}")
-        orders_placed.append(("ASK", ask_resp))
-        
-        return True
-        
-    except Exception as e:
-        print(f"SDK order method failed: {e}")
-        return False
+    return placed == len(orders)
 
 def check_order_book_after_seeding(info):
     """Check the order book after placing seed orders."""
@@ -306,10 +249,10 @@ def main():
     print("HIP-3 Order Book Seeding Tool (Enhanced)")
     print("=" * 50)
     
+    from hyperliquid.utils import constants  # deferred: keeps the SDK import off the startup path
+
     # Setup connection
-    address, info, exchange = setup(
-        base_url=constants.TESTNET_API_URL, skip_ws=True, perp_dexs=[DUMMY_DEX]
-    )
+    address, info, exchange = get_clients(constants.TESTNET_API_URL, perp_dexs=[DUMMY_DEX])
     
     print(f"Account: {address}")
     print(f"Target coin: {COIN}")
@@ -337,9 +280,10 @@ def main():
     if success:
         print("\n✓ Seed orders placed successfully!")
         
-        # Wait a moment for orders to be processed
-        print("Waiting 5 seconds for orders to be processed...")
-        time.sleep(5)
+        # Wait (push-based) until the book shows both sides, up to BOOK_WAIT_TIMEOUT
+        print(f"Waiting up to {BOOK_WAIT_TIMEOUT:.0f}s for orders to appear on the book...")
+        if not wait_for_two_sided_book(COIN, BOOK_WAIT_TIMEOUT, constants.TESTNET_API_URL, [DUMMY_DEX]):
+            print("No two-sided book update received; checking via REST")
         
         # Check order book after seeding
         book_ok = check_order_book_after_seeding(info)
@@ -355,7 +299,7 @@ def main():
             fallback_success = place_seed_orders(exchange, info)
             if fallback_success:
                 print("✓ Fallback method succeeded!")
-                time.sleep(3)
+                wait_for_two_sided_book(COIN, BOOK_WAIT_TIMEOUT, constants.TESTNET_API_URL, [DUMMY_DEX])
                 check_order_book_after_seeding(info)
     else:
         print("\n✗ Failed to place seed orders. Check errors above.")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+cli.py
+
+One entry point for the contract oracle scripts. Running the checks and then an
+update from here pays interpreter start-up and the web3 import once, instead of
+once per script:
+
+    python -m src.cli test                # src/test/test_contract_oracle.py
+    python -m src.cli update [--dex btcx] # update_btc_feusd.py
+    python -m src.cli all [--dex btcx]    # test, then update if every test passed
+
+Run from the repository root (update_btc_feusd.py lives there).
+
+Exports:
+    main(argv=None) -> exit code
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _run_test(args: argparse.Namespace) -> int:
+    from src.test.test_contract_oracle import main as test_main
+
+    return test_main()
+
+
+def _run_update(args: argparse.Namespace) -> int:
+    from update_btc_feusd import main as update_main
+
+    return update_main(args.dex)
+
+
+def _run_all(args: argparse.Namespace) -> int:
+    code = _run_test(args)
+    if code != 0:
+        print("⏭️  Skipping the oracle update: contract checks failed")
+        return code
+    return _run_update(args)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="HIP-3 contract oracle tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("test", help="run the contract oracle checks").set_defaults(func=_run_test)
+    for name, func, help_text in (
+        ("update", _run_update, "push the BTC-FEUSD contract price to the oracle"),
+        ("all", _run_all, "run the checks, then the update if they all pass"),
+    ):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--dex", default="btcx", help="DEX handle (default: btcx)")
+        cmd.set_defaults(func=func)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,14 +7,95 @@ Strategy:
   1) Try HL Spot mid(base/quote) for preferred quotes (usually USDT0, then other stables).
   2) If no HL-Spot pair, use DexScreener on HyperEVM with token addresses.
   3) If still nothing, fall back to peg=1.0 (logged).
+
+Market lookups (1 and 2) are cached for FX_CACHE_TTL_SECS; a peg fallback is
+only remembered for PEG_CACHE_TTL_SECS so a real price is retried sooner.
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from hyperliquid.info import Info
 
-from src.prices.hl_spot_prices import get_spot_mid
+from src.prices.hl_spot_prices import get_spot_mid, find_spot_pair_index
 from src.prices.hyper_evm_prices import get_pair_mid_from_dexscreener
+from src.hl_utils.cache_utils import ttl_cache, info_key
+
+# Stable FX barely moves tick-to-tick; reuse resolved factors for this long
+FX_CACHE_TTL_SECS = 30.0
+# ...but retry sooner when we had to fall back to the peg
+PEG_CACHE_TTL_SECS = 5.0
+
+
+def _probe_spot_quotes(info: Info, symbol: str, preferred_quotes: Tuple[str, ...]) -> Optional[float]:
+    """
+    HL Spot mid for the most-preferred quote that has a live book.
+    Quotes without a listed pair are dropped using the cached spot catalog (no request);
+    the remaining order-book probes run concurrently, and we return as soon as the
+    best-ranked one succeeds, so the result matches a sequential scan.
+    """
+    listed = []
+    for q in preferred_quotes:
+        try:
+            find_spot_pair_index(info, symbol, q)
+            listed.append(q)
+        except Exception:
+            continue
+    if not listed:
+        return None
+    if len(listed) == 1:
+        try:
+            return get_spot_mid(info, symbol, listed[0])
+        except Exception:
+            return None
+
+    ex = ThreadPoolExecutor(max_workers=len(listed))
+    try:
+        futures = [ex.submit(get_spot_mid, info, symbol, q) for q in listed]
+        for f in futures:  # preference order; the rest keep running meanwhile
+            try:
+                return f.result()
+            except Exception:
+                continue
+        return None
+    finally:
+        ex.shutdown(wait=False, cancel_futures=True)
+
+
+def _fx_ttl(found: Optional[Tuple[str, float]]) -> float:
+    return PEG_CACHE_TTL_SECS if found is None else FX_CACHE_TTL_SECS
+
+
+@ttl_cache(FX_CACHE_TTL_SECS, key=info_key, ttl_for=_fx_ttl)
+def _lookup_stable_rate(
+    info: Info,
+    symbol: str,
+    preferred_quotes: Tuple[str, ...],
+    evm_addresses: Optional[Dict[str, str]],
+    evm_usd_reference: str,
+) -> Optional[Tuple[str, float]]:
+    """
+    Shared market lookup for both resolvers:
+      ("spot", symbol/quote mid) | ("dex", symbol/evm_usd_reference) | None (use the peg)
+    """
+    # A) HL Spot
+    mid = _probe_spot_quotes(info, symbol, preferred_quotes)
+    if mid is not None:
+        return "spot", mid
+
+    # B) DexScreener
+    if evm_addresses and symbol in evm_addresses and evm_usd_reference in evm_addresses:
+        try:
+            return "dex", get_pair_mid_from_dexscreener(evm_addresses[symbol], evm_addresses[evm_usd_reference])
+        except Exception:
+            pass
+
+    return None
+
+
+def clear_fx_cache() -> None:
+    """Drop cached stable factors (e.g. after an oracle push)."""
+    _lookup_stable_rate.cache_clear()
 
 
 def resolve_stable_usd_factor(
@@ -39,26 +120,12 @@ def resolve_stable_usd_factor(
 
     Raises only if everything is disabled/missing (we default to 1.0 otherwise).
     """
-    # A) HL Spot
-    last_err = None
-    for q in preferred_quotes:
-        try:
-            return get_spot_mid(info, symbol, q)
-        except Exception as e:
-            last_err = e
-            continue
-
-    # B) DexScreener
-    if evm_addresses and symbol in evm_addresses and evm_usd_reference in evm_addresses:
-        try:
-            return get_pair_mid_from_dexscreener(evm_addresses[symbol], evm_addresses[evm_usd_reference])
-        except Exception as e:
-            last_err = e
+    found = _lookup_stable_rate(info, symbol, tuple(preferred_quotes), evm_addresses, evm_usd_reference)
 
     # C) Peg
     # Logically we'd warn here; for now, return 1.0 so pipelines don't break.
     # Caller can check proximity-to-1 and decide whether to accept/push.
-    return 1.0
+    return 1.0 if found is None else found[1]
 
 
 def resolve_stable_usd_factor_with_usdc_reference(
@@ -88,26 +155,10 @@ def resolve_stable_usd_factor_with_usdc_reference(
         If USDT0/USDC = 0.99993 and USDC/USD = 1.002:
         Returns 0.99993 * 1.002 = 1.00193
     """
-    # Try HL Spot first (these are already stable/USD-like)
-    last_err = None
-    for q in preferred_quotes:
-        try:
-            return get_spot_mid(info, symbol, q)
-        except Exception as e:
-            last_err = e
-            continue
-    
-    # Try DexScreener with USDC reference
-    if evm_addresses and symbol in evm_addresses and evm_usd_reference in evm_addresses:
-        try:
-            stable_usdc_rate = get_pair_mid_from_dexscreener(
-                evm_addresses[symbol], 
-                evm_addresses[evm_usd_reference]
-            )
-            # Convert stable/USDC to stable/USD
-            return stable_usdc_rate * usdc_usd_rate
-        except Exception as e:
-            last_err = e
-    
-    # Fallback to peg
-    return 1.0
+    # HL Spot quotes are already stable/USD-like; DexScreener quotes are stable/USDC
+    found = _lookup_stable_rate(info, symbol, tuple(preferred_quotes), evm_addresses, evm_usd_reference)
+    if found is None:
+        return 1.0  # Fallback to peg
+    source, rate = found
+    # Convert stable/USDC to stable/USD
+    return rate * usdc_usd_rate if source == "dex" else rate
@@ -0,0 +1,62 @@
+"""
+bootstrap.py
+
+One place for the scripts (update_btc_feusd.py, btc_feusd_oracle_loop.py,
+src/test/test_contract_oracle.py) to load the contract oracle module.
+
+Third-party dependencies are checked with importlib.util.find_spec first,
+which only looks the packages up on sys.path. A missing one is reported by
+name without paying for a partial web3 import. Any other ImportError from the
+import itself is reported the same way. The module is imported once and then
+served from sys.modules.
+
+Exports:
+    CONTRACT_DEPENDENCIES
+    MissingDependencyError(ImportError).missing -> [package, ...]
+    require_contract_module() -> src.hip3.hip3_update_oracle_contract
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import List, Sequence
+
+CONTRACT_MODULE = "src.hip3.hip3_update_oracle_contract"
+
+# import name -> pip package (for the error hint)
+CONTRACT_DEPENDENCIES = {
+    "web3": "web3",
+    "eth_utils": "eth_utils",
+    "eth_abi": "eth_abi",
+    "requests": "requests",
+    "hyperliquid": "hyperliquid-python-sdk",
+}
+
+
+class MissingDependencyError(ImportError):
+    """Raised when packages the contract oracle module needs are not installed."""
+
+    def __init__(self, missing: Sequence[str]):
+        self.missing: List[str] = list(missing)
+        super().__init__(
+            f"missing {', '.join(self.missing)}; try: pip install {' '.join(self.missing)}"
+        )
+
+
+def require_contract_module() -> ModuleType:
+    """Return the contract oracle module, importing it on first call."""
+    module = sys.modules.get(CONTRACT_MODULE)
+    if module is not None:
+        return module
+
+    missing = [pkg for name, pkg in CONTRACT_DEPENDENCIES.items() if importlib.util.find_spec(name) is None]
+    if missing:
+        raise MissingDependencyError(missing)
+    try:
+        return importlib.import_module(CONTRACT_MODULE)
+    except ImportError as e:
+        # a transitive dependency (eth_account, ...) or a broken install find_spec cannot see
+        raise MissingDependencyError([e.name or str(e)]) from e
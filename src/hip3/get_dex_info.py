@@ -12,18 +12,18 @@ What it prints:
 
 """
 
-import json
 from typing import List, Dict, Any
 
-# Your local helper that sets up wallet + clients
-import src.hl_utils.example_utils as example_utils
+# Your local helper that sets up wallet + clients (shared process-wide)
+from src.hl_utils.clients import get_clients
 from src.hip3.hip3_config import API_URL
+from src.hl_utils.json_utils import dumps_pretty
 
 
 def print_json(title: str, obj: Any) -> None:
     print(f"\n=== {title} ===")
     try:
-        print(json.dumps(obj, indent=2))
+        print(dumps_pretty(obj))
     except Exception:
         print(obj)
 
@@ -50,7 +50,9 @@ def summarize_universe(meta: Dict[str, Any], dex: str) -> None:
         print(f"  - {k}")
 
     # Helpful split (coin names)
-    coins = [n.split(":", 1)[1] for n in mapping_keys if n and n.startswith(f"{dex}:")]
+    prefix = f"{dex}:"
+    plen = len(prefix)
+    coins = [n[plen:] for n in mapping_keys if n and n.startswith(prefix)]
     print("\n[summary] Coin symbols (base-quote) detected:")
     for c in coins:
         print(f"  - {c}")
@@ -82,7 +84,7 @@ def get_info_dex(dex: str):
     # You can use example_utils.setup if you want wallet & exchange too,
     # but for read-only inspection Info is enough.
     # Keeping example_utils.setup so you also see the wallet address you’re using.
-    address, info, exchange = example_utils.setup(API_URL, skip_ws=True)  # noqa: F841
+    address, info, exchange = get_clients(API_URL)  # noqa: F841
     print(f"Running with account address: {address}")
 
     # Auction status (tells you if you can register new assets right now)
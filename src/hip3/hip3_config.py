@@ -26,6 +26,9 @@ DEX_SPECS = [
     }
 ]
 
+# DEX handle -> spec, derived once from DEX_SPECS (edit DEX_SPECS, not this)
+SPEC_BY_DEX = {s["dex"]: s for s in DEX_SPECS}
+
 
 # ---- HyperEVM token addresses for FX fallbacks (fill these) ----
 # Checksummed addresses on HyperEVM for DexScreener lookups
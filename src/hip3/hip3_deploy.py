@@ -7,60 +7,88 @@ Deploy a HIP-3 DEX (one collateral per DEX) and register its assets.
 - Resolves collateralToken index via spot_meta()
 - First register_asset call with `schema` creates the DEX
 - Subsequent register_asset calls (schema=None) add more assets
+- deploy_dexes() runs several DEX deployments concurrently (reads overlap,
+  signed register calls are serialized on the shared wallet)
 """
 
+from __future__ import annotations
+
+import asyncio
+import re
 import time
-import json
 import sys
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from hyperliquid.info import Info
-from hyperliquid.utils.error import ServerError
+if TYPE_CHECKING:  # the SDK is imported lazily (it is slow to import)
+    from hyperliquid.info import Info
 
 # your local helpers
 from src.hip3.hip3_config import API_URL, DEX_SPECS, MAX_GAS
 
-# NOTE: example_utils is from HL examples. Replace with your own setup if needed.
-import src.hl_utils.example_utils as example_utils
+# NOTE: clients come from example_utils (HL examples). Replace with your own setup if needed.
+from src.hl_utils.clients import get_clients
+from src.hip3 import meta_cache
+from src.hl_utils.http_session import attach_session
+from src.hl_utils.backoff import SIGNED_ACTIONS, backoff_delay, sleep_backoff
+from src.hl_utils.json_utils import dumps_pretty
+
+# Universe index lookup used by callers outside this module (e.g. seed_order_book)
+get_universe_index = meta_cache.universe_index
+
+
+def invalidate_meta_cache() -> None:
+    """Forget every cached spot/DEX meta (call after creating a DEX so the next read is fresh)."""
+    meta_cache.invalidate(all_dexes=True)
+
+
+def _is_retryable(e: Exception) -> bool:
+    """Transient failures worth another Info attempt: HL 5xx, connection errors and timeouts."""
+    import requests
+    from hyperliquid.utils.error import ServerError
+
+    if isinstance(e, ServerError):
+        status = getattr(e, "status_code", None)
+        return bool(status) and 500 <= int(status) < 600
+    return isinstance(e, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+
+def _info_retry_wait(e: Exception, attempt: int, retries: int, base_delay: float) -> float:
+    """Backoff before the next Info attempt; re-raises errors that are fatal or out of attempts."""
+    if attempt >= retries or not _is_retryable(e):
+        raise e
+    status = getattr(e, "status_code", None)
+    label = f"HL API {status}" if status else str(e)
+    wait = backoff_delay(attempt - 1, base=base_delay, cap=30.0)
+    print(f"[warn] {label} attempt {attempt}/{retries}; sleep {wait:.1f}s", file=sys.stderr)
+    return wait
 
 
 def create_info_with_retry(api_url: str, retries: int = 6, base_delay: float = 0.8) -> Info:
-    """Instantiate Info with exponential backoff on transient 5xx."""
-    last_err = None
+    """Instantiate Info (on the shared keep-alive session), backing off only on transient failures."""
+    from hyperliquid.info import Info
+
     for attempt in range(1, retries + 1):
         try:
-            return Info(api_url, skip_ws=True)
-        except ServerError as e:
-            status = getattr(e, "status_code", None)
-            if status and 500 <= int(status) < 600:
-                wait = base_delay * (2 ** (attempt - 1))
-                print(f"[warn] HL API {status} attempt {attempt}/{retries}; sleep {wait:.1f}s", file=sys.stderr)
-                time.sleep(wait)
-                last_err = e
-                continue
-            raise
+            return attach_session(Info(api_url, skip_ws=True))
         except Exception as e:
-            wait = base_delay * (2 ** (attempt - 1))
-            print(f"[warn] {e} attempt {attempt}/{retries}; sleep {wait:.1f}s", file=sys.stderr)
-            time.sleep(wait)
-            last_err = e
-            continue
-    raise last_err  # type: ignore
+            time.sleep(_info_retry_wait(e, attempt, retries, base_delay))
+    raise RuntimeError("unreachable: retries must be >= 1")
 
 
 def get_collateral_index(info: Info, symbol: str) -> int:
-    """Return spot token index for `symbol` (exact case) from spot_meta()."""
-    spot = info.spot_meta()
-    for t in spot.get("tokens", []):
-        if t.get("name") == symbol:
-            return int(t["index"])
+    """Return spot token index for `symbol` (exact case) from spot_meta() (cached)."""
+    index = meta_cache.spot_token_index(info).get(symbol)
+    if index is not None:
+        return index
     raise RuntimeError(f"Collateral symbol not found in spot_meta tokens: {symbol}")
 
 
 def register_first_asset_and_create_dex(exchange, address: str, dex_spec: Dict, collateral_index: int):
     """Create DEX via first register_asset (with schema)."""
     first = dex_spec["assets"][0]
-    return exchange.perp_deploy_register_asset(
+    SIGNED_ACTIONS.acquire()
+    res = exchange.perp_deploy_register_asset(
         dex=dex_spec["dex"],
         max_gas=MAX_GAS,
         coin=f'{dex_spec["dex"]}:{first["coin"]}',
@@ -74,113 +102,187 @@ def register_first_asset_and_create_dex(exchange, address: str, dex_spec: Dict,
             "oracleUpdater": address,  # this wallet can update the oracle later
         },
     )
+    invalidate_meta_cache()
+    return res
+
 
+# Response fragments meaning "slow down and resend"
+_RATE_LIMIT_RE = re.compile(r"too often|rate limit|too many requests", re.IGNORECASE)
 
-def register_extra_assets(exchange, dex_spec: Dict):
-    """Add remaining assets (no schema)."""
+# register_asset error classes, tried in priority order (an "already exists" reply wins over "busy")
+_REGISTER_ERR_CLASSES = (
+    ("dup", re.compile(r"already exists|duplicate|asset exists", re.IGNORECASE)),
+    ("transient", re.compile(r"auction|temporarily|busy|try again", re.IGNORECASE)),
+)
+
+
+def _is_rate_limited(res) -> bool:
+    return _RATE_LIMIT_RE.search(str((res or {}).get("response", ""))) is not None
+
+
+def _classify_register_err(err) -> str:
+    """'dup' | 'transient' | 'fatal' for a register_asset error message."""
+    text = str(err or "")
+    for label, pattern in _REGISTER_ERR_CLASSES:
+        if pattern.search(text):
+            return label
+    return "fatal"
+
+
+def register_extra_assets(exchange, dex_spec: Dict, rate_limit_retries: int = 3):
+    """
+    Add remaining assets (no schema).
+    Registrations are sent back-to-back: each call returns only once the action is
+    acknowledged, so the next one always carries a later nonce. We only pause when
+    the API answers with a rate-limit hint. The DEX's cached meta is dropped once afterwards.
+    """
+    try:
+        _register_extra_assets(exchange, dex_spec, rate_limit_retries)
+    finally:
+        meta_cache.invalidate(dex_spec["dex"])
+
+
+def _register_extra_assets(exchange, dex_spec: Dict, rate_limit_retries: int) -> None:
     for asset in dex_spec["assets"][1:]:
-        res = exchange.perp_deploy_register_asset(
-            dex=dex_spec["dex"],
-            max_gas=MAX_GAS,
-            coin=f'{dex_spec["dex"]}:{asset["coin"]}',
-            sz_decimals=int(asset["sz_decimals"]),
-            oracle_px=str(asset["initial_oracle_px"]),
-            margin_table_id=int(dex_spec["margin_table_id"]),
-            only_isolated=True,
-            schema=None,
-        )
+        for attempt in range(rate_limit_retries + 1):
+            SIGNED_ACTIONS.acquire()
+            res = exchange.perp_deploy_register_asset(
+                dex=dex_spec["dex"],
+                max_gas=MAX_GAS,
+                coin=f'{dex_spec["dex"]}:{asset["coin"]}',
+                sz_decimals=int(asset["sz_decimals"]),
+                oracle_px=str(asset["initial_oracle_px"]),
+                margin_table_id=int(dex_spec["margin_table_id"]),
+                only_isolated=True,
+                schema=None,
+            )
+            if not _is_rate_limited(res) or attempt == rate_limit_retries:
+                break
+            wait = sleep_backoff(attempt, base=0.5)
+            print(f"[retry {attempt + 1}/{rate_limit_retries}] {dex_spec['dex']}:{asset['coin']} rate limited; slept {wait:.1f}s")
         print(f"[register asset] {dex_spec['dex']}:{asset['coin']} -> {res}")
-        time.sleep(1)
+
+
+async def deploy_one_dex(exchange, address: str, info: Info, dex_spec: Dict, write_lock: asyncio.Lock) -> Dict:
+    """
+    Create one DEX and register its assets.
+    The collateral lookup and final meta read run concurrently with other DEXes;
+    register calls hold `write_lock` because every DEX signs with the same wallet nonce.
+    """
+    dex = dex_spec["dex"]
+    coll_index = await asyncio.to_thread(get_collateral_index, info, dex_spec["collateral_symbol"])
+    async with write_lock:
+        print(f"\n=== Deploy DEX {dex} (collateral={dex_spec['collateral_symbol']}) ===")
+        res1 = await asyncio.to_thread(register_first_asset_and_create_dex, exchange, address, dex_spec, coll_index)
+        print(f"[create dex + register 1st asset] {dex} ->", res1)
+        await asyncio.sleep(1)  # let the new DEX propagate before adding assets
+        await asyncio.to_thread(register_extra_assets, exchange, dex_spec)
+    meta = await asyncio.to_thread(info.meta, dex=dex)
+    return {"dex": dex, "create_result": res1, "meta": meta}
+
+
+async def deploy_dexes(exchange, address: str, info: Info, specs: Optional[List[Dict]] = None) -> List:
+    """
+    Deploy every spec (default: DEX_SPECS) concurrently.
+    Returns one entry per spec, in order: the deploy_one_dex result or the exception raised.
+    """
+    write_lock = asyncio.Lock()
+    return await asyncio.gather(
+        *(deploy_one_dex(exchange, address, info, spec, write_lock) for spec in (specs or DEX_SPECS)),
+        return_exceptions=True,
+    )
 
 
 def get_missing_assets(info: Info, dex_spec: Dict) -> list:
     """Return list of assets that are missing from the DEX."""
     try:
-        meta = info.meta(dex=dex_spec["dex"])
-        deployed_assets = set()
-        
-        # Get list of deployed assets from meta
-        if "universe" in meta:
-            for asset in meta["universe"]:
-                asset_name = asset.get("name", "")
-                if asset_name.startswith(f"{dex_spec['dex']}:"):
-                    coin_name = asset_name.split(":", 1)[1]
-                    deployed_assets.add(coin_name)
-        
-        # Find missing assets
-        missing_assets = []
-        for asset in dex_spec["assets"]:
-            if asset["coin"] not in deployed_assets:
-                missing_assets.append(asset)
-        
-        return missing_assets
+        deployed_assets = meta_cache.deployed_coins(info, dex_spec["dex"])
+        return [asset for asset in dex_spec["assets"] if asset["coin"] not in deployed_assets]
     except Exception as e:
         print(f"[warn] Could not check existing assets for {dex_spec['dex']}: {e}")
         # If we can't check, assume all assets are missing
         return dex_spec["assets"]
 
 
-def register_missing_assets(exchange, dex_spec: dict, missing_assets: list, max_retries: int = 3):
-    for asset in missing_assets:
-        retries = 0
-        while retries < max_retries:
-            try:
-                res = exchange.perp_deploy_register_asset(
-                    dex=dex_spec["dex"],                 # e.g. "btcx"
-                    max_gas=None,                        # <-- ensure SDK omits maxGas in JSON
-                    coin=str(asset["coin"]),             # e.g. "BTC-USDHL" (NO "dex:" prefix)
-                    sz_decimals=int(asset["sz_decimals"]),
-                    oracle_px=str(asset["initial_oracle_px"]),
-                    margin_table_id=int(dex_spec["margin_table_id"]),
-                    only_isolated=bool(asset.get("isolated_only", False)),
-                    schema=None,                         # adding to existing DEX
-                )
-
-                status = (res or {}).get("status", "").lower()
-                err = (res or {}).get("response", "") or (res or {}).get("error", "")
-
-                if status == "ok":
-                    print(f"[success] {dex_spec['dex']}:{asset['coin']} registered")
-                    break
-
-                if any(s in (err or "").lower() for s in ["already exists", "duplicate", "asset exists"]):
-                    print(f"[ok-idempotent] {dex_spec['dex']}:{asset['coin']} already registered")
-                    break
-
-                if any(s in (err or "").lower() for s in ["auction", "gas auction", "temporarily", "busy", "try again"]):
-                    retries += 1
-                    sleep = 1.5 * retries
-                    print(f"[retry {retries}/{max_retries}] transient: {err} -> sleep {sleep:.1f}s")
-                    time.sleep(sleep)
-                    continue
-
-                print(f"[failed] {dex_spec['dex']}:{asset['coin']} - {err or 'Unknown error'}")
-                break
+def _register_one(exchange, dex_spec: dict, asset: dict, max_retries: int) -> str:
+    """Register one missing asset with retries; returns 'ok' | 'dup' | 'failed'."""
+    retries = 0
+    while retries < max_retries:
+        try:
+            SIGNED_ACTIONS.acquire()
+            res = exchange.perp_deploy_register_asset(
+                dex=dex_spec["dex"],                 # e.g. "btcx"
+                max_gas=None,                        # <-- ensure SDK omits maxGas in JSON
+                coin=str(asset["coin"]),             # e.g. "BTC-USDHL" (NO "dex:" prefix)
+                sz_decimals=int(asset["sz_decimals"]),
+                oracle_px=str(asset["initial_oracle_px"]),
+                margin_table_id=int(dex_spec["margin_table_id"]),
+                only_isolated=bool(asset.get("isolated_only", False)),
+                schema=None,                         # adding to existing DEX
+            )
+
+            status = (res or {}).get("status", "").lower()
+            err = (res or {}).get("response", "") or (res or {}).get("error", "")
 
-            except Exception as e:
+            if status == "ok":
+                print(f"[success] {dex_spec['dex']}:{asset['coin']} registered")
+                return "ok"
+
+            kind = _classify_register_err(err)
+            if kind == "dup":
+                print(f"[ok-idempotent] {dex_spec['dex']}:{asset['coin']} already registered")
+                return "dup"
+
+            if kind == "transient":
+                sleep = sleep_backoff(retries, base=0.5)
                 retries += 1
-                if retries < max_retries:
-                    sleep = 1.5 * retries
-                    print(f"[retry {retries}/{max_retries}] exception: {e} -> sleep {sleep:.1f}s")
-                    time.sleep(sleep)
-                else:
-                    print(f"[failed] {dex_spec['dex']}:{asset['coin']} - exception after max retries: {e}")
-                    break
-
-        time.sleep(0.5)
-
-def deploy_missing_assets_only():
-    """Deploy only the assets that are missing from existing DEXes."""
+                print(f"[retry {retries}/{max_retries}] transient: {err} -> slept {sleep:.1f}s")
+                continue
+
+            print(f"[failed] {dex_spec['dex']}:{asset['coin']} - {err or 'Unknown error'}")
+            return "failed"
+
+        except Exception as e:
+            retries += 1
+            if retries < max_retries:
+                sleep = sleep_backoff(retries - 1, base=0.5)
+                print(f"[retry {retries}/{max_retries}] exception: {e} -> slept {sleep:.1f}s")
+            else:
+                print(f"[failed] {dex_spec['dex']}:{asset['coin']} - exception after max retries: {e}")
+                return "failed"
+    return "failed"
+
+
+def register_missing_assets(exchange, dex_spec: dict, missing_assets: list, max_retries: int = 3) -> Dict[str, str]:
+    """
+    Register `missing_assets` on an existing DEX, one after another in DEX_SPECS order:
+    every call signs with the same wallet, and the order fixes the new assets' universe indices.
+    The DEX's cached meta is dropped once afterwards so the next read shows the new assets.
+    Returns {coin: 'ok' | 'dup' | 'failed'}.
+    """
+    try:
+        return {asset["coin"]: _register_one(exchange, dex_spec, asset, max_retries) for asset in missing_assets}
+    finally:
+        meta_cache.invalidate(dex_spec["dex"])
+
+
+# DEX meta reads issued concurrently by deploy_missing_assets_only
+DISCOVERY_WORKERS = 8
+
+
+def deploy_missing_assets_only(debug: bool = False):
+    """Deploy only the assets that are missing from existing DEXes (debug=True also dumps the full meta)."""
     # 0) Wallet + connections
-    address, info, exchange = example_utils.setup(API_URL, skip_ws=True)
+    address, info, exchange = get_clients(API_URL)
     print("perp deploy auction:", info.query_perp_deploy_auction_status())
 
-    # 1) Check each DEX for missing assets
-    for spec in DEX_SPECS:
+    # 1) Discover missing assets on every DEX at once (independent meta reads), then register serially
+    with ThreadPoolExecutor(max_workers=DISCOVERY_WORKERS) as pool:
+        discovery = list(pool.map(lambda s: (s, get_missing_assets(info, s)), DEX_SPECS))
+
+    for spec, missing_assets in discovery:
         print(f"\n=== Checking DEX {spec['dex']} for missing assets ===")
         
-        missing_assets = get_missing_assets(info, spec)
-        
         if not missing_assets:
             print(f"[info] All assets already deployed for {spec['dex']}")
             continue
@@ -192,8 +294,11 @@ def deploy_missing_assets_only():
         # Deploy missing assets
         register_missing_assets(exchange, spec, missing_assets)
         
-        # 2) Show final meta
-        meta = info.meta(dex=spec["dex"])
-        print("[meta]", spec["dex"], "->", json.dumps(meta, indent=2))
+        # 2) Show final meta (re-read: registering invalidated the cached copy)
+        meta = meta_cache.cached_meta(info, spec["dex"])
+        names = [a.get("name") for a in meta.get("universe", [])]
+        print("[meta]", spec["dex"], "->", f"{len(names)} assets:", names)
+        if debug:
+            print("[meta]", spec["dex"], "->", dumps_pretty(meta))
 
     print("\nMissing assets deployment completed.")
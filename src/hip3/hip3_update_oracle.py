@@ -6,137 +6,144 @@ Importable module to update HIP-3 perp oracle prices.
 
 Exports:
     update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -> dict
+    update_oracle_for_dexes(dexes: list[str] | None = None, strict: bool = False, debug: bool = False) -> dict
+    update_oracle_for_dexes_async(...) -> dict   (same, awaitable; pushes run concurrently)
 
 Behavior:
 - Only pushes prices for assets that are ALREADY deployed (read from meta.universe).
 - Optional strict mode fails if some configured assets aren't deployed yet.
 - Includes retry handling for the common "missing perp" propagation issue.
+- Skips the push ("noop") while oracle_common.should_update says no coin needs one
+  (every price within ORACLE_MIN_BPS of the last successful push, for up to ORACLE_HEARTBEAT_S).
 
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import time
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Any, Optional, Tuple
 
-from hyperliquid.info import Info
-# Your local helper that returns (address, info, exchange)
-import src.hl_utils.example_utils as example_utils
+if TYPE_CHECKING:
+    from hyperliquid.info import Info
 
-from src.hip3.hip3_config import API_URL, DEX_SPECS, EVM_ADDR
+# Your local helper that returns (address, info, exchange), shared process-wide
+from src.hl_utils.clients import get_clients
+from src.hl_utils.json_utils import dumps_pretty
+from src.hip3.oracle_common import ORACLE_MIN_BPS, format_oracle_px, set_oracle_with_retry, should_update
+
+from src.hip3.hip3_config import API_URL, DEX_SPECS, EVM_ADDR, SPEC_BY_DEX
+from src.hip3 import meta_cache
 from src.prices.redstone_prices import fetch_redstone_prices
 from src.compute.stable_fx import resolve_stable_usd_factor
 
 
-# ----------------------- internal helpers ----------------------- #
+# Configured coin -> (base, quote), e.g. 'BTC-FEUSD' -> ('BTC', 'FEUSD'); split once at import
+_PAIR_BY_COIN: Dict[str, Tuple[str, str]] = {
+    a["coin"]: tuple(a["coin"].split("-", 1)) for s in DEX_SPECS for a in s["assets"]
+}
+
+# Concurrent set_oracle pushes allowed in update_oracle_for_dexes
+MAX_PUSH_CONCURRENCY = 4
+
+# dex -> (monotonic time of last ok push, {coin: price pushed})
+_LAST_PUSHED: Dict[str, Tuple[float, Dict[str, float]]] = {}
 
-def _build_price_map_for_dex(dex: str, coin_to_price: Dict[str, float]) -> Dict[str, str]:
-    """{'BTC-FEUSD': 65234.12} -> {'btcx:BTC-FEUSD': '65234.120000000000'}"""
-    return {f"{dex}:{coin}": f"{float(px):.12f}" for coin, px in coin_to_price.items()}
 
+# ----------------------- internal helpers ----------------------- #
 
-def _coins_deployed_in_universe(info: Info, dex: str) -> List[str]:
-    """Return the list of 'coin' strings (e.g., 'BTC-FEUSD') currently deployed on this DEX."""
-    meta = info.meta(dex=dex)
-    deployed: List[str] = []
-    for a in meta.get("universe", []):
-        name = a.get("name", "")
-        if name.startswith(f"{dex}:"):
-            deployed.append(name.split(":", 1)[1])  # keep only the coin part
-    return deployed
+def _unchanged_since_last_push(dex: str, prices: Dict[str, float]) -> bool:
+    """True when should_update says no coin needs a push since the last ok push of this DEX."""
+    last = _LAST_PUSHED.get(dex)
+    if last is None:
+        return False
+    pushed_at, pushed = last
+    if pushed.keys() != prices.keys():
+        return False
+    age_s = time.monotonic() - pushed_at
+    return not any(should_update(pushed[c], px, age_s) for c, px in prices.items())
 
 
-def _set_oracle_with_retry(exchange, dex: str, mapping: Dict[str, str], tries: int = 5, debug: bool = False) -> Dict[str, Any]:
+def _invalidate_price_caches() -> None:
     """
-    Call perp_deploy_set_oracle with a small retry loop for propagation:
-    - If we see "missing perp" in the response, wait and retry.
-    - For any other error, return immediately.
+    Drop the cached RedStone answer so the next update reads a fresh BTC/USD.
+    Stable FX factors are left to their own TTL (see stable_fx.FX_CACHE_TTL_SECS).
     """
-    last_res: Dict[str, Any] = {}
-    for i in range(tries):
-        try:
-            res = exchange.perp_deploy_set_oracle(dex, mapping, [], mapping)
-            last_res = res if isinstance(res, dict) else {"status": "err", "response": res}
-        except Exception as e:
-            last_res = {"status": "err", "response": str(e)}
-            if debug:
-                print(f"[debug] Exception during oracle set: {e}")
+    fetch_redstone_prices.cache_clear()
 
-        # Print the full response for debugging
-        if debug:
-            print(f"[debug] Attempt {i+1} - Full response: {last_res}")
-            print(f"[debug] Response type: {type(last_res)}")
-            if isinstance(last_res, dict):
-                print(f"[debug] Keys: {list(last_res.keys())}")
-
-        status = last_res.get("status")
-        if status == "ok":
-            return last_res
-
-        msg = str(last_res.get("response", "")).lower()
-        if "missing perp" in msg:
-            wait = 2.0 * (i + 1)
-            if debug:
-                print(f"[retry {i+1}/{tries}] oracle set: missing perp, waiting {wait:.1f}s...")
-            time.sleep(wait)
-            continue
-
-        if "oracle price update too often" in msg:
-            wait = 3.0  # Wait 3 seconds for rate limit
-            if debug:
-                print(f"[retry {i+1}/{tries}] oracle set: rate limited, waiting {wait:.1f}s...")
-            time.sleep(wait)
-            continue
-
-        # Different error -> bail out early
-        if debug:
-            print(f"[debug] Different error, stopping retries: {msg}")
-        return last_res
 
-    return last_res
+def _coins_deployed_in_universe(info: Info, dex: str) -> FrozenSet[str]:
+    """Return the set of 'coin' strings (e.g., 'BTC-FEUSD') currently deployed on this DEX."""
+    return meta_cache.deployed_coins(info, dex)
 
 
-# ----------------------- public API ----------------------- #
+def _quotes_for_dexes(dexes: List[str]) -> List[str]:
+    """Union of quote symbols ('BTC-FEUSD' -> 'FEUSD') configured across these DEXes."""
+    return sorted({
+        _PAIR_BY_COIN[a["coin"]][1]
+        for dex in dexes if dex in SPEC_BY_DEX
+        for a in SPEC_BY_DEX[dex]["assets"]
+    })
 
-def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -> Dict[str, Any]:
+
+def _fetch_reference_prices(info: Info, quotes: List[str], debug: bool) -> Tuple[float, Dict[str, float]]:
     """
-    Update oracle prices for a given DEX.
-    - Reads configured assets from DEX_SPECS.
-    - Filters to assets that actually exist on-chain (meta.universe).
-    - Computes BTC/<stable> prices and pushes them via set_oracle.
-    - Returns a structured result dict.
+    BTC/USD from RedStone and a {quote: quote/USD factor} map, fetched once for every quote given.
+    Both sources are TTL-cached (redstone_prices.PRICE_CACHE_TTL_SECS, stable_fx.FX_CACHE_TTL_SECS),
+    so reads within one update reuse them. After a successful push the RedStone answer is
+    dropped (_invalidate_price_caches), so the next update starts from a fresh BTC/USD;
+    the FX factors keep their own TTL across updates.
+    """
+    rs = fetch_redstone_prices(["BTC", "USDT0", "USDC"])
+    btc_usd = float(rs["BTC"]["value"])
+    if debug:
+        print(f"[debug] BTC/USD from RedStone: {btc_usd}")
 
-    Args:
-        dex: DEX handle (e.g. 'btcx').
-        strict: If True, fail if any configured asset isn't deployed yet.
-        debug: If True, print extra info.
+    fx_cache: Dict[str, float] = {}
+    for sym in quotes:
+        fx_cache[sym] = resolve_stable_usd_factor(
+            info, sym, evm_addresses=EVM_ADDR, evm_usd_reference="USDC"
+        )
+        if debug:
+            print(f"[debug] {sym}/USD factor: {fx_cache[sym]}")
+    return btc_usd, fx_cache
 
-    Returns:
-        {
-          "status": "ok" | "err" | "noop",
-          "pushed_coins": [ ... ],
-          "mapping": { "btcx:BTC-FEUSD": "12345.000000000000", ... },
-          "raw_result": { ... },   # RPC response (if any)
-          "missing": [ ... ]       # configured-but-not-deployed (strict or debug)
-        }
-    """
-    # 0) Setup connections
-    address, info, exchange = example_utils.setup(API_URL, skip_ws=True)  # noqa: F841
 
+def _plan_oracle_update(
+    dex: str,
+    strict: bool,
+    debug: bool,
+    info: Info,
+    btc_usd: Optional[float] = None,
+    fx_cache: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+    """
+    Everything update_oracle_for_dex does before the push (reads + price math).
+    `btc_usd` / `fx_cache` may be preloaded by a caller covering several DEXes.
+    Returns a finished result ("err"/"noop") or one with status "pending" and the mapping to push.
+    """
     # 1) Find DEX spec
-    spec = next((s for s in DEX_SPECS if s["dex"] == dex), None)
+    spec = SPEC_BY_DEX.get(dex)
     if not spec:
         raise ValueError(f"DEX '{dex}' not found in DEX_SPECS")
 
-    # 2) Determine deployed vs configured assets
-    deployed = set(_coins_deployed_in_universe(info, dex))
-    configured = [a["coin"] for a in spec["assets"]]
-    target_coins = [c for c in configured if c in deployed]
-    missing = [c for c in configured if c not in deployed]
+    # 2) Determine deployed vs configured assets (one pass; quotes collected alongside)
+    deployed = _coins_deployed_in_universe(info, dex)
+    target_coins: List[str] = []
+    missing: List[str] = []
+    fx_syms = set()
+    for a in spec["assets"]:
+        coin = a["coin"]
+        if coin in deployed:
+            target_coins.append(coin)
+            fx_syms.add(_PAIR_BY_COIN[coin][1])
+        else:
+            missing.append(coin)
 
     if debug:
-        print(f"[debug] configured: {configured}")
+        print(f"[debug] configured: {[a['coin'] for a in spec['assets']]}")
         print(f"[debug] deployed  : {sorted(deployed)}")
         print(f"[debug] target    : {target_coins}")
         if missing:
@@ -162,49 +169,199 @@ def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -
             "raw_result": None,
         }
 
-    # 3) Fetch BTC and stable reference prices
-    rs = fetch_redstone_prices(["BTC", "USDT0", "USDC"])
-    btc_usd = float(rs["BTC"]["value"])
-    if debug:
-        print(f"[debug] BTC/USD from RedStone: {btc_usd}")
-
-    fx_syms = {c.split("-", 1)[1] for c in target_coins}  # quotes for the deployed coins
-    hl_info = Info(API_URL, skip_ws=True)
-    fx_cache: Dict[str, float] = {}
-    for sym in fx_syms:
-        fx_cache[sym] = resolve_stable_usd_factor(
-            hl_info, sym, evm_addresses=EVM_ADDR, evm_usd_reference="USDC"
-        )
-        if debug:
-            print(f"[debug] {sym}/USD factor: {fx_cache[sym]}")
+    # 3) Fetch BTC and stable reference prices (unless the caller preloaded them)
+    if btc_usd is None or fx_cache is None or any(sym not in fx_cache for sym in fx_syms):
+        btc_usd, fx_cache = _fetch_reference_prices(info, sorted(fx_syms), debug)
 
-    # 4) Compute BTC/QUOTE = (BTC/USD) / (QUOTE/USD)
+    # 4) Compute BTC/QUOTE = (BTC/USD) / (QUOTE/USD) and the oracle mapping in the same pass
+    prefix = dex + ":"
     prices: Dict[str, float] = {}
+    mapping: Dict[str, str] = {}
     for coin in target_coins:
-        base, quote = coin.split("-", 1)
+        base, quote = _PAIR_BY_COIN[coin]
         if base != "BTC":
             raise ValueError(f"Only BTC-* supported by this example; got {coin}")
-        fx = fx_cache.get(quote) or 1.0
-        prices[coin] = btc_usd / fx
+        px = btc_usd / (fx_cache.get(quote) or 1.0)
+        mapping[prefix + coin] = format_oracle_px(px)
+        prices[coin] = px
 
-    mapping = _build_price_map_for_dex(dex, prices)
+    if _unchanged_since_last_push(dex, prices):
+        if debug:
+            print(f"[debug] {dex}: prices within {ORACLE_MIN_BPS} bps of last push, skipping")
+        return {
+            "status": "noop",
+            "reason": "no material change",
+            "missing": missing,
+            "pushed_coins": [],
+            "mapping": mapping,
+            "raw_result": None,
+        }
 
     if debug:
-        # What the backend sees right now
-        meta_now = Info(API_URL, skip_ws=True).meta(dex=dex)
+        # What the backend reported (cached meta, same read as step 2)
+        meta_now = meta_cache.cached_meta(info, dex)
         universe_names = [a.get("name") for a in meta_now.get("universe", [])]
         print("[debug] universe now:", universe_names)
-        print("[debug] mapping:", json.dumps(mapping, indent=2))
-
-    # 5) Push oracle with retry handling
-    res = _set_oracle_with_retry(exchange, dex, mapping, tries=5, debug=debug)
-
-    status = "ok" if isinstance(res, dict) and res.get("status") == "ok" else "err"
+        print("[debug] mapping:", dumps_pretty(mapping))
 
     return {
-        "status": status,
+        "status": "pending",
         "pushed_coins": target_coins,
         "mapping": mapping,
-        "raw_result": res,
+        "raw_result": None,
         "missing": missing,
     }
+
+
+def _push_planned(exchange, dex: str, plan: Dict[str, Any], debug: bool) -> Dict[str, Any]:
+    """Step 5 of update_oracle_for_dex: push a "pending" plan with retry handling."""
+    res = set_oracle_with_retry(exchange, dex, plan["mapping"], tries=5, debug=debug)
+    status = "ok" if isinstance(res, dict) and res.get("status") == "ok" else "err"
+    if status == "ok":
+        plen = len(dex) + 1  # mapping keys are '<dex>:<coin>'
+        _LAST_PUSHED[dex] = (time.monotonic(), {k[plen:]: float(v) for k, v in plan["mapping"].items()})
+    return {**plan, "status": status, "raw_result": res}
+
+
+def _error_result(e: BaseException) -> Dict[str, Any]:
+    return {
+        "status": "err",
+        "reason": str(e),
+        "missing": [],
+        "pushed_coins": [],
+        "mapping": {},
+        "raw_result": None,
+    }
+
+
+# ----------------------- public API ----------------------- #
+
+def update_oracle_for_dex(
+    dex: str,
+    strict: bool = False,
+    debug: bool = False,
+    *,
+    clients: Optional[Tuple[str, Info, Any]] = None,
+    btc_usd: Optional[float] = None,
+    fx_cache: Optional[Dict[str, float]] = None,
+    invalidate_prices: bool = True,
+) -> Dict[str, Any]:
+    """
+    Update oracle prices for a given DEX.
+    - Reads configured assets from DEX_SPECS.
+    - Filters to assets that actually exist on-chain (meta.universe).
+    - Computes BTC/<stable> prices and pushes them via set_oracle.
+    - Returns a structured result dict.
+
+    Args:
+        dex: DEX handle (e.g. 'btcx').
+        strict: If True, fail if any configured asset isn't deployed yet.
+        debug: If True, print extra info.
+        clients: Optional (address, info, exchange) to use instead of the
+                 process-wide get_clients(API_URL) ones.
+        btc_usd, fx_cache: Optional preloaded BTC/USD and {quote: factor}
+                 (skips the RedStone / FX lookups when they cover every quote).
+        invalidate_prices: Drop the cached RedStone answer after a successful push
+                 (default). Callers pushing several DEXes in a row pass False and
+                 invalidate once at the end, as update_oracle_for_dexes does.
+
+    Returns:
+        {
+          "status": "ok" | "err" | "noop",
+          "pushed_coins": [ ... ],
+          "mapping": { "btcx:BTC-FEUSD": "12345.000000000000", ... },
+          "raw_result": { ... },   # RPC response (if any)
+          "missing": [ ... ]       # configured-but-not-deployed (strict or debug)
+        }
+    """
+    # 0) Setup connections
+    address, info, exchange = clients or get_clients(API_URL)  # noqa: F841
+
+    plan = _plan_oracle_update(dex, strict, debug, info, btc_usd, fx_cache)
+    if plan["status"] != "pending":
+        return plan
+
+    # 5) Push oracle with retry handling
+    result = _push_planned(exchange, dex, plan, debug)
+    if result["status"] == "ok" and invalidate_prices:
+        _invalidate_price_caches()
+    return result
+
+
+async def update_oracle_for_dexes_async(
+    dexes: Optional[List[str]] = None,
+    strict: bool = False,
+    debug: bool = False,
+    max_concurrency: int = MAX_PUSH_CONCURRENCY,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Awaitable update_oracle_for_dexes.
+    BTC/USD and the FX factors for every quote used by these DEXes are fetched once up front;
+    per-DEX reads and price math then run in order and the set_oracle pushes then run concurrently, at most `max_concurrency` at a time.
+    The signed calls themselves go out one at a time (oracle_common nonce gate); what overlaps
+    is their retry backoff.
+    """
+    dexes = dexes if dexes is not None else [s["dex"] for s in DEX_SPECS]
+    address, info, exchange = get_clients(API_URL)  # noqa: F841
+
+    try:
+        btc_usd, fx_cache = _fetch_reference_prices(info, _quotes_for_dexes(dexes), debug)
+    except Exception as e:
+        if debug:
+            print(f"[debug] batched price fetch failed, falling back per DEX: {e}")
+        btc_usd, fx_cache = None, None
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for dex in dexes:
+        try:
+            results[dex] = _plan_oracle_update(dex, strict, debug, info, btc_usd, fx_cache)
+        except Exception as e:
+            results[dex] = _error_result(e)
+
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def push(dex: str) -> Dict[str, Any]:
+        async with sem:
+            return await asyncio.to_thread(_push_planned, exchange, dex, results[dex], debug)
+
+    pending = [dex for dex in dexes if results[dex]["status"] == "pending"]
+    pushed = await asyncio.gather(*(push(dex) for dex in pending), return_exceptions=True)
+    for dex, res in zip(pending, pushed):
+        results[dex] = _error_result(res) if isinstance(res, BaseException) else res
+
+    if debug:
+        for dex in dexes:
+            print(f"[debug] {dex}: {results[dex]['status']}")
+    _invalidate_price_caches()
+    return results
+
+
+def update_oracle_for_dexes(
+    dexes: Optional[List[str]] = None,
+    strict: bool = False,
+    debug: bool = False,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Update oracle prices for several DEXes in one pass.
+    - Wallet/Info/Exchange are set up once and shared by every DEX push.
+    - Each DEX still gets its own set_oracle action (HL oracles are per-DEX);
+      those pushes are sent concurrently (see update_oracle_for_dexes_async).
+    - A failure on one DEX is recorded and does not stop the others.
+    - Safe to call from inside a running event loop (e.g. a notebook): the pass then runs on
+      its own loop in a worker thread; async callers should await update_oracle_for_dexes_async.
+
+    Args:
+        dexes: DEX handles; defaults to every DEX in DEX_SPECS.
+        strict, debug: forwarded to update_oracle_for_dex.
+
+    Returns:
+        { "<dex>": <update_oracle_for_dex result>, ... }
+    """
+    run = functools.partial(asyncio.run, update_oracle_for_dexes_async(dexes, strict=strict, debug=debug))
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()  # no loop in this thread: the normal script case
+    # asyncio.run refuses to nest inside a running loop; give the pass a thread of its own
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run).result()
@@ -5,7 +5,23 @@ hip3_update_oracle_contract.py
 Contract-based oracle updater for HIP-3 perp oracle prices using HyperEVM testnet.
 
 Exports:
-    update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -> dict
+    update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False, dry_run: bool = False) -> dict
+    read_contract_prices(symbols, debug=False, use_batch=True) -> [price data, ...] (one request)
+    read_contract_snapshot(symbol, debug=False) -> price data + 'admin' (one Multicall3 call)
+    invalidate_price_cache(symbol=None) -> force the next contract read to hit the RPC
+    check_price_window(symbol, price_info, window_size=5, heartbeat_s=1800, ...) -> None | reason to hold the push
+    should_update(current_on_oracle, price, age_s, ...) -> bool (re-exported from oracle_common)
+    read_oracle_price(dex, symbol="BTC-FEUSD") -> price currently posted on the HL oracle, or None
+    last_push_age_s(dex, symbol="BTC-FEUSD") -> seconds since this process last pushed it, or None
+    invalidate_universe_cache(dex: str) -> None
+    get_w3() -> process-wide Web3 client (keep-alive pooled session)
+    now_chain_ts() -> HyperEVM chain time from the last Multicall3 read (local clock fallback)
+
+Environment:
+    HYPEREVM_WS_URL   websocket endpoint for feed log subscriptions (optional)
+    HL_W3_POOL_SIZE   max pooled HTTP connections to RPC_URL (default 8)
+    HL_W3_WS_URL      websocket RPC endpoint; when set, the shared Web3 client talks over
+                      one persistent websocket instead of HTTP POSTs (optional)
 
 Behavior:
 - Reads prices from HyperEVM testnet contract instead of RedStone API
@@ -17,20 +33,34 @@ Behavior:
 
 from __future__ import annotations
 
-import json
+import atexit
+import functools
+import os
+import statistics
+import threading
 import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Tuple
 
+import requests
+from requests.adapters import HTTPAdapter
 from web3 import Web3
+from web3 import exceptions as web3_exceptions
 from eth_utils import keccak
 from hyperliquid.info import Info
 
 # Your local helper that returns (address, info, exchange)
-import src.hl_utils.example_utils as example_utils
+from src.hl_utils.clients import get_clients
+from src.hl_utils.json_utils import dumps_pretty, loads as json_loads, orjson
+from src.hl_utils.cache_utils import ttl_cache
+from src.hip3 import meta_cache
+from src.hl_utils.backoff import retry_call
 
-from src.hip3.hip3_config import API_URL, DEX_SPECS, EVM_ADDR
+from src.hip3.hip3_config import API_URL, EVM_ADDR, SPEC_BY_DEX
 from src.compute.stable_fx import resolve_stable_usd_factor
+from src.hip3.multicall import MULTICALL3_ADDRESS, MulticallBatcher
+from src.hip3.oracle_common import format_oracle_px, set_oracle_with_retry, should_update  # noqa: F401 (re-export)
 
 
 # ----------------------- Contract Configuration ----------------------- #
@@ -39,6 +69,16 @@ from src.compute.stable_fx import resolve_stable_usd_factor
 CONTRACT_ADDRESS = "0x492f4913E411691807c53b178c1E36F4144E9889"
 RPC_URL = "https://evmrpc-jp.hyperpc.app/adae36120cb94b9984f348314cdca711"
 CHAIN_ID = 998
+CHECKSUM_ADDR = Web3.to_checksum_address(CONTRACT_ADDRESS)
+
+# Optional websocket endpoint, used to subscribe to the feed contract's logs
+WS_URL = os.environ.get("HYPEREVM_WS_URL", "")
+
+# Pooled connections to RPC_URL (raise it when many threads read feeds at once)
+W3_POOL_SIZE = int(os.environ.get("HL_W3_POOL_SIZE", "8"))
+
+# Optional websocket JSON-RPC endpoint for the shared client (persistent connection, cheaper framing)
+W3_WS_URL = os.environ.get("HL_W3_WS_URL", "")
 
 # Contract ABI for the functions we need
 CONTRACT_ABI = [
@@ -70,36 +110,303 @@ SYMBOL_TO_CONTRACT_FEED = {
     "BTC-FEUSD": "BTC-FEUSD",
 }
 
+# Feed reads are reused for this long (covers set_oracle's ~3s "update too often" window);
+# update_btc_feusd_oracle drops the entry after a successful push
+CONTRACT_PRICE_TTL_SECS = 3.0
+
+# keccak256(feed name) for every configured feed, hashed once at import
+FEED_IDS: Dict[str, bytes] = {feed: keccak(text=feed) for feed in SYMBOL_TO_CONTRACT_FEED.values()}
+
+# 4-byte selectors of the feed getters: calldata for a bytes32 feed ID is just selector + ID,
+# so the read paths build it by concatenation instead of a web3 ABI encode per call
+SEL_VALUE = keccak(text="getValueForDataFeed(bytes32)")[:4]
+SEL_TIMESTAMP = keccak(text="getTimestampForDataFeed(bytes32)")[:4]
+SEL_ADMIN = keccak(text="admin()")[:4]
+SEL_BLOCK_TIMESTAMP = keccak(text="getCurrentBlockTimestamp()")[:4]  # on Multicall3 itself
+
+# Full (value, timestamp) calldata for every configured feed, built once
+_FEED_CALLDATA: Dict[bytes, Tuple[bytes, bytes]] = {
+    feed_id: (SEL_VALUE + feed_id, SEL_TIMESTAMP + feed_id) for feed_id in FEED_IDS.values()
+}
+
+# Configured symbol -> (feed ID, (value, timestamp) calldata): one lookup per read
+_SYMBOL_FEEDS: Dict[str, Tuple[bytes, Tuple[bytes, bytes]]] = {
+    symbol: (FEED_IDS[feed], _FEED_CALLDATA[FEED_IDS[feed]]) for symbol, feed in SYMBOL_TO_CONTRACT_FEED.items()
+}
+
+
+# ----------------------- Cached Clients ----------------------- #
+
+@functools.lru_cache(maxsize=1)
+def _rpc_session() -> requests.Session:
+    """Keep-alive session to RPC_URL, shared by the Web3 client and raw JSON-RPC batches."""
+    session = requests.Session()
+    session.headers.update({"Connection": "keep-alive"})
+    # max_retries=0: transient eth_call failures are retried once, with jitter, by retry_call
+    # (_eth_call / _execute), not replayed again underneath it by urllib3
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=W3_POOL_SIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+def _orjson_default(obj: Any) -> Any:
+    """What web3's JSON encoder does for the non-JSON types found in RPC params."""
+    if isinstance(obj, (bytes, bytearray)):
+        return "0x" + bytes(obj).hex()  # HexBytes.hex() drops the prefix on hexbytes>=1.0
+    if hasattr(obj, "keys"):
+        return dict(obj)  # AttributeDict
+    raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+
+class _OrjsonHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTPProvider that encodes requests and decodes responses with orjson
+    (Multicall3 replies are long hex strings). Anything orjson refuses is
+    handed back to web3's own encoder / decoder.
+    """
+
+    def encode_rpc_request(self, method, params):
+        try:
+            request = {"jsonrpc": "2.0", "method": method, "params": params or [], "id": next(self.request_counter)}
+            return orjson.dumps(request, default=_orjson_default)
+        except (AttributeError, TypeError):
+            return super().encode_rpc_request(method, params)
+
+    def decode_rpc_response(self, raw_response: bytes):
+        try:
+            return json_loads(raw_response)
+        except ValueError:
+            return super().decode_rpc_response(raw_response)  # raises web3's descriptive decode error
+
+
+@functools.lru_cache(maxsize=1)
+def _w3() -> Web3:
+    """
+    Process-wide Web3 client: over W3_WS_URL when configured, else on a keep-alive
+    requests.Session (one TLS handshake for the whole run). Raw JSON-RPC batches
+    always use the HTTP session.
+    """
+    if W3_WS_URL:
+        import web3
+
+        # web3 v7 renamed the sync websocket provider; v6 only has WebsocketProvider
+        provider_cls = getattr(web3, "LegacyWebSocketProvider", None) or web3.WebsocketProvider
+        return Web3(provider_cls(W3_WS_URL, websocket_timeout=10))
+    provider_cls = _OrjsonHTTPProvider if orjson is not None else Web3.HTTPProvider
+    return Web3(provider_cls(RPC_URL, session=_rpc_session(), request_kwargs={"timeout": 10}))
+
+
+def get_w3() -> Web3:
+    """Public accessor for the shared Web3 client (callers must not build their own)."""
+    return _w3()
+
+
+@functools.lru_cache(maxsize=1)
+def _contract():
+    """Feed contract bound to the cached client; the ABI is parsed once."""
+    return _w3().eth.contract(address=CHECKSUM_ADDR, abi=CONTRACT_ABI)
+
+
+def _hl_clients():
+    """(address, info, exchange) for API_URL, shared with the rest of the process."""
+    return get_clients(API_URL)
+
 
 # ----------------------- Contract Helpers ----------------------- #
 
 def get_data_feed_id(symbol: str) -> bytes:
-    """Generate data feed ID for a symbol (keccak256 hash)"""
-    return keccak(text=symbol)
+    """Generate data feed ID for a symbol (keccak256 hash); configured feeds come from FEED_IDS"""
+    return FEED_IDS.get(symbol) or keccak(text=symbol)
 
 
-def read_contract_price(symbol: str, debug: bool = False) -> Dict[str, Any]:
+def _symbol_feed(symbol: str) -> Tuple[bytes, Tuple[bytes, bytes]]:
+    """(feed ID, (value, timestamp) calldata) for a symbol; unconfigured symbols are hashed as feed names."""
+    hit = _SYMBOL_FEEDS.get(symbol)
+    if hit is not None:
+        return hit
+    feed_id = get_data_feed_id(SYMBOL_TO_CONTRACT_FEED.get(symbol, symbol))
+    return feed_id, _feed_calldata(feed_id)
+
+
+def _feed_calldata(data_feed_id: bytes) -> Tuple[bytes, bytes]:
+    """(getValueForDataFeed, getTimestampForDataFeed) calldata for a 32-byte feed ID."""
+    return _FEED_CALLDATA.get(data_feed_id) or (SEL_VALUE + data_feed_id, SEL_TIMESTAMP + data_feed_id)
+
+
+def _uint256(ret: bytes) -> int:
+    """Decode a single uint256 return value."""
+    if len(ret) < 32:
+        raise ValueError(f"short uint256 return data: 0x{ret.hex()}")
+    return int.from_bytes(ret[:32], "big")
+
+
+def _address(ret: bytes) -> str:
+    """Decode a single address return value (right-aligned in a 32-byte word)."""
+    if len(ret) < 32:
+        raise ValueError(f"short address return data: 0x{ret.hex()}")
+    return Web3.to_checksum_address(ret[12:32])
+
+
+# Transient RPC failures worth a quick in-process retry (reads only)
+_TRANSIENT_RPC_ERRORS = tuple(
+    exc for exc in (
+        requests.Timeout,
+        requests.ConnectionError,
+        requests.HTTPError,  # only 429 / 5xx, see _is_transient_rpc_error
+        ConnectionError,
+        TimeoutError,
+        getattr(web3_exceptions, "BadResponseFormat", None),  # web3 >= 6
+    ) if exc is not None
+)
+
+
+def _is_transient_rpc_error(e: BaseException) -> bool:
+    """False for HTTP errors a retry cannot fix (400 / 401 / 403 ...): only 429 and 5xx are retried."""
+    if isinstance(e, requests.HTTPError):
+        status = getattr(e.response, "status_code", None)
+        return status is not None and (status == 429 or status >= 500)
+    return True
+
+
+def _eth_call(w3: Web3, tx: Dict[str, Any]) -> bytes:
+    """w3.eth.call with a few jittered retries on transient RPC errors."""
+    return bytes(retry_call(
+        w3.eth.call, tx, retry_on=_TRANSIENT_RPC_ERRORS, retry_if=_is_transient_rpc_error, label="eth_call"
+    ))
+
+
+def _execute(batcher: MulticallBatcher):
+    """batcher.execute() with the same retries (queued calls are kept until it succeeds)."""
+    return retry_call(
+        batcher.execute, retry_on=_TRANSIENT_RPC_ERRORS, retry_if=_is_transient_rpc_error, label="multicall eth_call"
+    )
+
+
+def _rpc_batch_eth_call(to: str, calldata: List[str]) -> List[int]:
     """
-    Read price data from the HyperEVM testnet contract
-    
-    Args:
-        symbol: Trading pair symbol (e.g., "BTC-FEUSD")
-        debug: Enable debug output
-        
-    Returns:
-        dict: {
-            'symbol': str,
-            'price': float,
-            'raw_price': int,
-            'timestamp': int,
-            'last_update': datetime,
-            'age_seconds': int,
-            'age_minutes': int,
-            'contract': str,
-            'network': str,
-            'data_feed_id': str
-        }
+    Send several eth_calls to `to` as one JSON-RPC batch (single HTTP POST) and
+    decode each uint256 result. Raises if the node rejects batches or any call errors.
+    """
+    batch = [
+        {"jsonrpc": "2.0", "id": i, "method": "eth_call", "params": [{"to": to, "data": data}, "latest"]}
+        for i, data in enumerate(calldata)
+    ]
+    resp = _rpc_session().post(RPC_URL, json=batch, timeout=10)
+    resp.raise_for_status()
+    replies = json_loads(resp.content)
+    if not isinstance(replies, list):
+        raise RuntimeError(f"JSON-RPC batch not supported: {replies}")
+    by_id = {r.get("id"): r for r in replies}
+    out = []
+    for i in range(len(calldata)):
+        reply = by_id.get(i) or {}
+        if "result" not in reply:
+            raise RuntimeError(f"eth_call {i} failed: {reply.get('error', reply)}")
+        out.append(int(reply["result"], 16))
+    return out
+
+
+def _read_feed_values(
+    w3: Web3, contract, data_feed_id: bytes, debug: bool = False, calldata: Optional[Tuple[bytes, bytes]] = None
+) -> Tuple[int, int]:
+    """
+    Read (raw_value, timestamp) for a data feed in a single Multicall3 round trip.
+    Falls back to one JSON-RPC batch of the two eth_calls, then to two direct calls.
+    `calldata` is the feed's precomputed pair (see _symbol_feed), else it is looked up.
     """
+    value_data, ts_data = calldata or _feed_calldata(data_feed_id)
+    try:
+        batcher = MulticallBatcher(w3)
+        batcher.add(contract.address, value_data)
+        batcher.add(contract.address, ts_data)
+        _add_block_timestamp(batcher)
+        (ok_value, ret_value), (ok_ts, ret_ts), block_ts = _execute(batcher)
+        _note_block_timestamp(block_ts)
+        if ok_value and ok_ts:
+            return _uint256(ret_value), _uint256(ret_ts)
+        if debug:
+            print("⚠️  Multicall3 sub-call reverted, falling back to a JSON-RPC batch")
+    except Exception as e:
+        if debug:
+            print(f"⚠️  Multicall3 unavailable ({e}), falling back to a JSON-RPC batch")
+
+    try:
+        raw_price, timestamp = _rpc_batch_eth_call(contract.address, ["0x" + value_data.hex(), "0x" + ts_data.hex()])
+        return raw_price, timestamp
+    except Exception as e:
+        if debug:
+            print(f"⚠️  JSON-RPC batch failed ({e}), falling back to direct calls")
+
+    raw_price = _uint256(_eth_call(w3, {"to": contract.address, "data": value_data}))
+    timestamp = _uint256(_eth_call(w3, {"to": contract.address, "data": ts_data}))
+    return raw_price, timestamp
+
+
+# Latest HyperEVM block timestamp seen: (monotonic time of the read, block timestamp).
+# Every Multicall3 feed read also asks for getCurrentBlockTimestamp(), so feed ages are
+# measured against chain time without a separate eth_getBlockByNumber round trip.
+CHAIN_TS_TTL_SECS = 5.0
+_CHAIN_TS: Tuple[float, int] = (0.0, 0)
+
+
+def _add_block_timestamp(batcher: MulticallBatcher) -> int:
+    return batcher.add(MULTICALL3_ADDRESS, SEL_BLOCK_TIMESTAMP)
+
+
+def _note_block_timestamp(result: Tuple[bool, bytes]) -> None:
+    global _CHAIN_TS
+    ok, ret = result
+    if ok and len(ret) >= 32:
+        _CHAIN_TS = (time.monotonic(), _uint256(ret))
+
+
+def now_chain_ts() -> int:
+    """Chain time (last block timestamp seen + time since that read) if fresh, else the local clock."""
+    seen_at, block_ts = _CHAIN_TS
+    elapsed = time.monotonic() - seen_at
+    if block_ts and elapsed < CHAIN_TS_TTL_SECS:
+        return block_ts + int(elapsed)
+    return int(time.time())
+
+
+def _price_result(symbol: str, raw_price: int, timestamp: int, data_feed_id: bytes, debug: bool = False) -> Dict[str, Any]:
+    """Build the read_contract_price result dict from a feed's raw (value, timestamp)."""
+    # Convert raw price (scaled by 10^8) to decimal
+    price_decimal = raw_price / 1e8
+    
+    # Calculate age on integer unix seconds (no datetime arithmetic), against chain time when known
+    age_seconds = max(0, now_chain_ts() - timestamp)
+    age_minutes = age_seconds // 60
+    
+    result = {
+        'symbol': symbol,
+        'price': price_decimal,
+        'raw_price': raw_price,
+        'timestamp': timestamp,
+        'updated_at': timestamp,
+        'last_update': datetime.fromtimestamp(timestamp),  # display only
+        'age_seconds': age_seconds,
+        'age_minutes': age_minutes,
+        'contract': CONTRACT_ADDRESS,
+        'network': f'HyperEVM Testnet (Chain ID: {CHAIN_ID})',
+        'data_feed_id': data_feed_id.hex()
+    }
+    
+    if debug:
+        print(f"💰 {symbol}: {price_decimal:,.6f} (age: {age_minutes}min)")
+    
+    return result
+
+
+def _symbol_key(symbol: str, debug: bool = False) -> str:
+    return symbol  # debug only changes logging, not the result
+
+
+@ttl_cache(CONTRACT_PRICE_TTL_SECS, key=_symbol_key)
+def _read_contract_price_cached(symbol: str, debug: bool = False) -> Dict[str, Any]:
+    """read_contract_price without the copy: the returned dict is the shared cache entry."""
     try:
         # Map symbol to contract feed name if needed
         contract_symbol = SYMBOL_TO_CONTRACT_FEED.get(symbol, symbol)
@@ -107,23 +414,17 @@ def read_contract_price(symbol: str, debug: bool = False) -> Dict[str, Any]:
         if debug:
             print(f"🔗 Connecting to HyperEVM testnet for {symbol} -> {contract_symbol}...")
         
-        # Connect to HyperEVM testnet
-        w3 = Web3(Web3.HTTPProvider(RPC_URL))
-        
-        if not w3.is_connected():
-            raise Exception("Failed to connect to HyperEVM testnet")
+        # Reuse the process-wide client; only probe connectivity when debugging
+        w3 = _w3()
+        contract = _contract()
         
         if debug:
+            if not w3.is_connected():
+                raise Exception("Failed to connect to HyperEVM testnet")
             print(f"✅ Connected to chain ID: {w3.eth.chain_id}")
         
-        # Load contract
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-            abi=CONTRACT_ABI
-        )
-        
-        # Generate data feed ID
-        data_feed_id = get_data_feed_id(contract_symbol)
+        # Data feed ID + calldata, precomputed for configured symbols
+        data_feed_id, calldata = _symbol_feed(symbol)
         if debug:
             print(f"📋 Data Feed ID for {contract_symbol}: {data_feed_id.hex()}")
         
@@ -131,35 +432,8 @@ def read_contract_price(symbol: str, debug: bool = False) -> Dict[str, Any]:
         if debug:
             print(f"📊 Reading price data from contract...")
         
-        raw_price = contract.functions.getValueForDataFeed(data_feed_id).call()
-        timestamp = contract.functions.getTimestampForDataFeed(data_feed_id).call()
-        
-        # Convert raw price (scaled by 10^8) to decimal
-        price_decimal = raw_price / 1e8
-        
-        # Calculate age
-        last_update = datetime.fromtimestamp(timestamp)
-        current_time = datetime.now()
-        age_seconds = int((current_time - last_update).total_seconds())
-        age_minutes = age_seconds // 60
-        
-        result = {
-            'symbol': symbol,
-            'price': price_decimal,
-            'raw_price': raw_price,
-            'timestamp': timestamp,
-            'last_update': last_update,
-            'age_seconds': age_seconds,
-            'age_minutes': age_minutes,
-            'contract': CONTRACT_ADDRESS,
-            'network': f'HyperEVM Testnet (Chain ID: {CHAIN_ID})',
-            'data_feed_id': data_feed_id.hex()
-        }
-        
-        if debug:
-            print(f"💰 {symbol}: {price_decimal:,.6f} (age: {age_minutes}min)")
-        
-        return result
+        raw_price, timestamp = _read_feed_values(w3, contract, data_feed_id, debug=debug, calldata=calldata)
+        return _price_result(symbol, raw_price, timestamp, data_feed_id, debug=debug)
         
     except Exception as e:
         if debug:
@@ -167,15 +441,150 @@ def read_contract_price(symbol: str, debug: bool = False) -> Dict[str, Any]:
         raise Exception(f"Failed to read price for {symbol} from contract: {e}")
 
 
+def read_contract_price(symbol: str, debug: bool = False) -> Dict[str, Any]:
+    """
+    Read price data from the HyperEVM testnet contract.
+    Results are cached per symbol for CONTRACT_PRICE_TTL_SECS
+    (invalidate_price_cache(symbol) forces a fresh read); each call gets its own copy.
+    
+    Args:
+        symbol: Trading pair symbol (e.g., "BTC-FEUSD")
+        debug: Enable debug output
+        
+    Returns:
+        dict: {
+            'symbol': str,
+            'price': float,
+            'raw_price': int,
+            'timestamp': int,
+            'updated_at': int,        # same as timestamp (unix seconds of the last feed write)
+            'last_update': datetime,
+            'age_seconds': int,
+            'age_minutes': int,
+            'contract': str,
+            'network': str,
+            'data_feed_id': str
+        }
+    """
+    return dict(_read_contract_price_cached(symbol, debug=debug))
+
+
+# Freshness / outlier gate over recent feed reads (see check_price_window)
+PRICE_WINDOW_SIZE = 5
+PRICE_HEARTBEAT_S = 1800          # feed must have been written within this many seconds
+PRICE_MAX_DEVIATION_BPS = 500.0   # reject a read this far from the window median
+PRICE_ACCEPT_READS = 3            # ... unless this many consecutive reads agree on the new level
+PRICE_ACCEPT_AFTER_S = 120.0      # ... or it has held for this long: then it becomes the window
+
+# symbol -> recent distinct (price, updated_at) reads, oldest first
+_RECENT_READS: Dict[str, deque] = {}
+# symbol -> (level, consecutive reads near it, monotonic time first held) for a held-off level
+_HELD_LEVEL: Dict[str, Tuple[float, int, float]] = {}
+_RECENT_LOCK = threading.Lock()
+
+
+def check_price_window(
+    symbol: str,
+    price_info: Dict[str, Any],
+    window_size: int = PRICE_WINDOW_SIZE,
+    heartbeat_s: float = PRICE_HEARTBEAT_S,
+    max_deviation_bps: float = PRICE_MAX_DEVIATION_BPS,
+    accept_reads: int = PRICE_ACCEPT_READS,
+    accept_after_s: float = PRICE_ACCEPT_AFTER_S,
+) -> Optional[str]:
+    """
+    Record a read_contract_price() result in the symbol's window and judge it.
+    Returns None when the price is safe to push, else the reason to hold off:
+    - the feed is older than heartbeat_s
+    - the feed timestamp went backwards (an older write served after a newer one)
+    - the price is more than max_deviation_bps from the median of the last window_size reads
+    Repeated reads of the same feed write are recorded once. A level that keeps deviating
+    is a real move, not an outlier: once accept_reads consecutive reads (repeats included)
+    agree on it, or it has been held for accept_after_s, the window restarts at it and the
+    read passes. That also recovers from an outlier first read. The window lives in this
+    process, so the median check needs a long-running caller (btc_feusd_oracle_loop.py).
+    """
+    price = float(price_info["price"])
+    updated_at = int(price_info["updated_at"])
+    age_s = now_chain_ts() - updated_at
+    if age_s > heartbeat_s:
+        return f"{symbol} feed is {age_s}s old (heartbeat {heartbeat_s:.0f}s)"
+
+    with _RECENT_LOCK:
+        window = _RECENT_READS.get(symbol)
+        if window is None or window.maxlen != window_size:
+            window = _RECENT_READS[symbol] = deque(window or (), maxlen=window_size)
+        if window and updated_at < window[-1][1]:
+            return f"{symbol} feed timestamp went backwards ({updated_at} < {window[-1][1]})"
+        if not window or window[-1][1] != updated_at:
+            window.append((price, updated_at))
+        median = statistics.median_low(p for p, _ in window)
+        deviation_bps = abs(price - median) / median * 1e4 if median > 0 else 0.0
+        if deviation_bps <= max_deviation_bps:
+            _HELD_LEVEL.pop(symbol, None)
+            return None
+
+        now = time.monotonic()
+        level, reads, since = _HELD_LEVEL.get(symbol, (price, 0, now))
+        if abs(price - level) / level * 1e4 > max_deviation_bps:
+            level, reads, since = price, 0, now
+        reads += 1
+        if reads >= accept_reads or now - since >= accept_after_s:
+            _HELD_LEVEL.pop(symbol, None)
+            window.clear()
+            window.append((price, updated_at))
+            return None
+        _HELD_LEVEL[symbol] = (level, reads, since)
+
+    return (
+        f"{symbol} price {price:,.6f} is {deviation_bps:.0f} bps from the window median {median:,.6f}"
+        f" (held {reads}/{accept_reads} reads)"
+    )
+
+
+# (dex, symbol) -> monotonic time of the last ok push from this process
+_LAST_PUSH_AT: Dict[Tuple[str, str], float] = {}
+
+
+def read_oracle_price(dex: str, symbol: str = "BTC-FEUSD") -> Optional[float]:
+    """oraclePx of '<dex>:<symbol>' from metaAndAssetCtxs (one /info call), None if not listed."""
+    _, info, _ = _hl_clients()
+    meta, ctxs = info.post("/info", {"type": "metaAndAssetCtxs", "dex": dex})
+    name = f"{dex}:{symbol}"
+    for asset, ctx in zip(meta.get("universe", ()), ctxs):
+        if asset.get("name") == name:
+            px = ctx.get("oraclePx")
+            return float(px) if px is not None else None
+    return None
+
+
+def last_push_age_s(dex: str, symbol: str = "BTC-FEUSD") -> Optional[float]:
+    """Seconds since update_btc_feusd_oracle last pushed `symbol` on `dex` in this process, or None."""
+    pushed_at = _LAST_PUSH_AT.get((dex, symbol))
+    return None if pushed_at is None else time.monotonic() - pushed_at
+
+
+def invalidate_price_cache(symbol: Optional[str] = None) -> None:
+    """Drop cached read_contract_price results (one symbol, or all) so the next read hits the RPC."""
+    if symbol is None:
+        _read_contract_price_cached.cache_clear()
+    else:
+        _read_contract_price_cached.cache_invalidate(symbol)
+
+
+def oracle_log_filter() -> Dict[str, Any]:
+    """
+    eth_subscribe('logs') / eth_getLogs filter for price writes on the feed contract.
+    The feed only emits logs when a new value lands, so every matching log
+    means the on-chain price (and its timestamp) changed.
+    """
+    return {"address": CHECKSUM_ADDR}
+
+
 def check_contract_admin(debug: bool = False) -> str:
     """Check who is the admin of the contract"""
     try:
-        w3 = Web3(Web3.HTTPProvider(RPC_URL))
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(CONTRACT_ADDRESS),
-            abi=CONTRACT_ABI
-        )
-        admin = contract.functions.admin().call()
+        admin = _address(_eth_call(_w3(), {"to": CHECKSUM_ADDR, "data": SEL_ADMIN}))
         if debug:
             print(f"👤 Contract Admin: {admin}")
         return admin
@@ -185,77 +594,86 @@ def check_contract_admin(debug: bool = False) -> str:
         return None
 
 
+def read_contract_snapshot(symbol: str, debug: bool = False) -> Dict[str, Any]:
+    """
+    read_contract_price(symbol) plus the contract admin ('admin' key), fetched in one
+    Multicall3 eth_call. Falls back to the separate reads if the aggregate fails.
+    """
+    contract = _contract()
+    data_feed_id, calldata = _symbol_feed(symbol)
+    try:
+        batcher = MulticallBatcher(_w3())
+        for call_data in calldata:
+            batcher.add(contract.address, call_data)
+        batcher.add(contract.address, SEL_ADMIN)
+        _add_block_timestamp(batcher)
+        (ok_value, ret_value), (ok_ts, ret_ts), (ok_admin, ret_admin), block_ts = _execute(batcher)
+        _note_block_timestamp(block_ts)
+        if ok_value and ok_ts and ok_admin:
+            result = _price_result(symbol, _uint256(ret_value), _uint256(ret_ts), data_feed_id, debug=debug)
+            result["admin"] = _address(ret_admin)
+            if debug:
+                print(f"👤 Contract Admin: {result['admin']}")
+            return result
+        if debug:
+            print("⚠️  Multicall3 sub-call reverted, falling back to separate reads")
+    except Exception as e:
+        if debug:
+            print(f"⚠️  Multicall3 unavailable ({e}), falling back to separate reads")
+
+    result = read_contract_price(symbol, debug=debug)
+    result["admin"] = check_contract_admin(debug=debug)
+    return result
+
+
 # ----------------------- Internal Helpers ----------------------- #
 
 def _build_price_map_for_dex(dex: str, coin_to_price: Dict[str, float]) -> Dict[str, str]:
-    """{'BTC-FEUSD': 65234.12} -> {'btcx:BTC-FEUSD': '65234.120000000000'}"""
-    return {f"{dex}:{coin}": f"{float(px):.12f}" for coin, px in coin_to_price.items()}
+    """{'BTC-FEUSD': 65234.12} -> {'btcx:BTC-FEUSD': '65234.120000000000'} (prices are already floats)"""
+    prefix = dex + ":"
+    return {prefix + coin: format_oracle_px(px) for coin, px in coin_to_price.items()}
 
 
-def _coins_deployed_in_universe(info: Info, dex: str) -> List[str]:
-    """Return the list of 'coin' strings (e.g., 'BTC-FEUSD') currently deployed on this DEX."""
-    meta = info.meta(dex=dex)
-    deployed: List[str] = []
-    for a in meta.get("universe", []):
-        name = a.get("name", "")
-        if name.startswith(f"{dex}:"):
-            deployed.append(name.split(":", 1)[1])  # keep only the coin part
-    return deployed
+def _format_raw_1e8(raw: int) -> str:
+    """Feed value scaled by 1e8 -> exact 12-decimal string (6523412000000 -> '65234.120000000000')."""
+    whole, frac = divmod(raw, 10**8)
+    return f"{whole}.{frac:08d}0000"
 
 
-def _set_oracle_with_retry(exchange, dex: str, mapping: Dict[str, str], tries: int = 5, debug: bool = False) -> Dict[str, Any]:
-    """
-    Call perp_deploy_set_oracle with a small retry loop for propagation:
-    - If we see "missing perp" in the response, wait and retry.
-    - For any other error, return immediately.
-    """
-    last_res: Dict[str, Any] = {}
-    for i in range(tries):
-        try:
-            res = exchange.perp_deploy_set_oracle(dex, mapping, [], mapping)
-            last_res = res if isinstance(res, dict) else {"status": "err", "response": res}
-        except Exception as e:
-            last_res = {"status": "err", "response": str(e)}
-            if debug:
-                print(f"[debug] Exception during oracle set: {e}")
+def _build_raw_price_map_for_dex(dex: str, coin_to_raw: Dict[str, int]) -> Dict[str, str]:
+    """_build_price_map_for_dex for raw 1e8-scaled feed values, formatted without a float round trip."""
+    bad = [coin for coin, raw in coin_to_raw.items() if raw <= 0]
+    if bad:
+        raise ValueError(f"Refusing to push non-positive oracle prices for {bad}")
+    prefix = dex + ":"
+    return {prefix + coin: _format_raw_1e8(raw) for coin, raw in coin_to_raw.items()}
 
-        # Print the full response for debugging
-        if debug:
-            print(f"[debug] Attempt {i+1} - Full response: {last_res}")
-            print(f"[debug] Response type: {type(last_res)}")
-            if isinstance(last_res, dict):
-                print(f"[debug] Keys: {list(last_res.keys())}")
-
-        status = last_res.get("status")
-        if status == "ok":
-            return last_res
-
-        msg = str(last_res.get("response", "")).lower()
-        if "missing perp" in msg:
-            wait = 2.0 * (i + 1)
-            if debug:
-                print(f"[retry {i+1}/{tries}] oracle set: missing perp, waiting {wait:.1f}s...")
-            time.sleep(wait)
-            continue
 
-        if "oracle price update too often" in msg:
-            wait = 3.0  # Wait 3 seconds for rate limit
-            if debug:
-                print(f"[retry {i+1}/{tries}] oracle set: rate limited, waiting {wait:.1f}s...")
-            time.sleep(wait)
-            continue
+def _coins_deployed_in_universe(info: Info, dex: str) -> FrozenSet[str]:
+    """Return the set of 'coin' strings (e.g., 'BTC-FEUSD') currently deployed on this DEX (TTL-cached)."""
+    return meta_cache.deployed_coins(info, dex)
 
-        # Different error -> bail out early
-        if debug:
-            print(f"[debug] Different error, stopping retries: {msg}")
-        return last_res
 
-    return last_res
+def invalidate_universe_cache(dex: str) -> None:
+    """Forget the cached universe for `dex` (call after deploying a new asset on it)."""
+    meta_cache.invalidate(dex)
 
 
 # ----------------------- Public API ----------------------- #
 
-def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
+def deployed_coins(dex: str) -> FrozenSet[str]:
+    """Coins currently deployed on `dex`, using the cached HL clients."""
+    _, info, _ = _hl_clients()
+    return _coins_deployed_in_universe(info, dex)
+
+
+def update_btc_feusd_oracle(
+    dex: str,
+    debug: bool = False,
+    *,
+    price_info: Optional[Dict[str, Any]] = None,
+    deployed: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
     """
     Update oracle price for BTC-FEUSD specifically using HyperEVM contract data.
     - Only handles BTC-FEUSD symbol
@@ -265,6 +683,8 @@ def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
     Args:
         dex: DEX handle (e.g. 'btcx').
         debug: If True, print extra info.
+        price_info: Pre-fetched read_contract_price() result; skips the contract read.
+        deployed: Pre-fetched deployed_coins(dex); skips the meta lookup.
 
     Returns:
         {
@@ -276,11 +696,11 @@ def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
           "contract_data": { ... } # contract price details
         }
     """
-    # 0) Setup connections
-    address, info, exchange = example_utils.setup(API_URL, skip_ws=True)  # noqa: F841
+    # 0) Setup connections (cached across calls)
+    address, info, exchange = _hl_clients()  # noqa: F841
 
     # 1) Check if BTC-FEUSD is deployed on this DEX
-    deployed = set(_coins_deployed_in_universe(info, dex))
+    deployed = frozenset(deployed) if deployed is not None else _coins_deployed_in_universe(info, dex)
     target_symbol = "BTC-FEUSD"
     
     if debug:
@@ -298,16 +718,20 @@ def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
             "contract_data": {},
         }
 
-    # 2) Check contract admin if debug
+    # 2) Check contract admin if debug (already in a read_contract_snapshot() price_info)
     if debug:
-        check_contract_admin(debug=True)
+        if price_info is not None and price_info.get("admin"):
+            print(f"👤 Contract Admin: {price_info['admin']}")
+        else:
+            check_contract_admin(debug=True)
 
     # 3) Read BTC-FEUSD price from HyperEVM contract
     try:
         if debug:
             print(f"[debug] Reading contract price for {target_symbol}...")
         
-        price_info = read_contract_price(target_symbol, debug=debug)
+        if price_info is None:
+            price_info = read_contract_price(target_symbol, debug=debug)
         price = price_info['price']
         
         # Check if price is stale (older than 30 minutes)
@@ -329,20 +753,27 @@ def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
             "contract_data": {},
         }
 
-    # 4) Build mapping for oracle
-    mapping = {f"{dex}:{target_symbol}": f"{float(price):.12f}"}
+    # 4) Build mapping for oracle (exact, straight from the 1e8-scaled feed value when we have it)
+    raw_price = price_info.get('raw_price')
+    if isinstance(raw_price, int):
+        mapping = _build_raw_price_map_for_dex(dex, {target_symbol: raw_price})
+    else:
+        mapping = _build_price_map_for_dex(dex, {target_symbol: price})
 
     if debug:
-        # What the backend sees right now
-        meta_now = Info(API_URL, skip_ws=True).meta(dex=dex)
+        # What the backend reported (cached meta, same read as step 1)
+        meta_now = meta_cache.cached_meta(info, dex)
         universe_names = [a.get("name") for a in meta_now.get("universe", [])]
         print("[debug] universe now:", universe_names)
-        print("[debug] mapping:", json.dumps(mapping, indent=2))
+        print("[debug] mapping:", dumps_pretty(mapping))
 
     # 5) Push oracle with retry handling
-    res = _set_oracle_with_retry(exchange, dex, mapping, tries=5, debug=debug)
+    res = set_oracle_with_retry(exchange, dex, mapping, tries=5, debug=debug)
 
     status = "ok" if isinstance(res, dict) and res.get("status") == "ok" else "err"
+    if status == "ok":
+        _LAST_PUSH_AT[(dex, target_symbol)] = time.monotonic()
+        invalidate_price_cache(target_symbol)  # next tick reads the feed again
 
     return {
         "status": status,
@@ -354,7 +785,38 @@ def update_btc_feusd_oracle(dex: str, debug: bool = False) -> Dict[str, Any]:
     }
 
 
-def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -> Dict[str, Any]:
+def _dry_run_result(dex: str) -> Dict[str, Any]:
+    """update_oracle_for_dex(dry_run=True): config lookup + calldata encoding only, no RPC."""
+    spec = SPEC_BY_DEX.get(dex)
+    if spec is None:
+        return {
+            "status": "err",
+            "reason": f"DEX '{dex}' is not in DEX_SPECS",
+            "missing": [],
+            "pushed_coins": [],
+            "mapping": {},
+            "raw_result": None,
+            "contract_data": {},
+        }
+    target_symbol = "BTC-FEUSD"
+    configured = target_symbol in {a["coin"] for a in spec["assets"]}
+    _, (value_data, ts_data) = _symbol_feed(target_symbol)
+    return {
+        "status": "dry_run",
+        "pushed_coins": [target_symbol] if configured else [],
+        "mapping": {},
+        "raw_result": None,
+        "missing": [] if configured else [target_symbol],
+        "contract_data": {},
+        "encoded_calls": {
+            "to": CHECKSUM_ADDR,
+            "getValueForDataFeed": "0x" + value_data.hex(),
+            "getTimestampForDataFeed": "0x" + ts_data.hex(),
+        },
+    }
+
+
+def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False, dry_run: bool = False) -> Dict[str, Any]:
     """
     Update oracle prices for a given DEX using HyperEVM contract data.
     - FOCUSED ON BTC-FEUSD ONLY
@@ -365,10 +827,12 @@ def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -
         dex: DEX handle (e.g. 'btcx').
         strict: If True, fail if BTC-FEUSD isn't deployed yet.
         debug: If True, print extra info.
+        dry_run: If True, only resolve the DEX config and encode the feed calls
+            (returned as "encoded_calls"); no RPC, no Info client, no push.
 
     Returns:
         {
-          "status": "ok" | "err" | "noop",
+          "status": "ok" | "err" | "noop" | "dry_run",
           "pushed_coins": [ "BTC-FEUSD" ],
           "mapping": { "btcx:BTC-FEUSD": "12345.000000000000" },
           "raw_result": { ... },   # RPC response (if any)
@@ -376,6 +840,9 @@ def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -
           "contract_data": { ... } # contract price details
         }
     """
+    if dry_run:
+        return _dry_run_result(dex)
+
     # Simply delegate to the focused BTC-FEUSD function
     result = update_btc_feusd_oracle(dex, debug=debug)
     
@@ -427,17 +894,18 @@ def update_oracle_for_dex(dex: str, strict: bool = False, debug: bool = False) -
 def read_btc_feusd_price(debug: bool = False) -> Dict[str, Any]:
     """
     Read BTC-FEUSD price from the contract.
-    Simplified version focused on single symbol.
+    Simplified version focused on single symbol. With debug, the contract admin
+    rides along in the same Multicall3 call (price data gains an 'admin' key).
     
     Returns:
         Dict with BTC-FEUSD price data or error
     """
-    if debug:
-        print("🔍 Reading BTC-FEUSD price from contract...")
-        check_contract_admin(debug=True)
-    
     try:
-        price_data = read_contract_price("BTC-FEUSD", debug=debug)
+        if debug:
+            print("🔍 Reading BTC-FEUSD price from contract...")
+            price_data = read_contract_snapshot("BTC-FEUSD", debug=True)
+        else:
+            price_data = read_contract_price("BTC-FEUSD", debug=debug)
         return {"BTC-FEUSD": price_data}
     except Exception as e:
         if debug:
@@ -445,15 +913,73 @@ def read_btc_feusd_price(debug: bool = False) -> Dict[str, Any]:
         return {"BTC-FEUSD": {"error": str(e)}}
 
 
+def _batched_feed_values(feed_ids: List[bytes], debug: bool = False) -> List[Optional[Tuple[int, int]]]:
+    """
+    (raw_value, timestamp) per feed from one Multicall3 eth_call, else one JSON-RPC batch
+    of all 2N eth_calls; None for feeds neither could read (the caller reads those alone).
+    """
+    contract = _contract()
+    calldata = [cd for feed_id in feed_ids for cd in _feed_calldata(feed_id)]
+    try:
+        batcher = MulticallBatcher(_w3())
+        for cd in calldata:
+            batcher.add(contract.address, cd)
+        _add_block_timestamp(batcher)
+        results = _execute(batcher)
+        _note_block_timestamp(results[-1])
+        return [
+            (_uint256(results[2 * i][1]), _uint256(results[2 * i + 1][1]))
+            if results[2 * i][0] and results[2 * i + 1][0] else None
+            for i in range(len(feed_ids))
+        ]
+    except Exception as e:
+        if debug:
+            print(f"⚠️  Multicall3 unavailable ({e}), trying one JSON-RPC batch")
+
+    try:
+        values = _rpc_batch_eth_call(contract.address, ["0x" + cd.hex() for cd in calldata])
+        return [(values[2 * i], values[2 * i + 1]) for i in range(len(feed_ids))]
+    except Exception as e:
+        if debug:
+            print(f"⚠️  JSON-RPC batch failed ({e}), reading feeds one by one")
+    return [None] * len(feed_ids)
+
+
+def read_contract_prices(symbols: List[str], debug: bool = False, use_batch: bool = True) -> List[Dict[str, Any]]:
+    """
+    read_contract_price for several symbols, in order ({"error": ...} for symbols that failed).
+    With use_batch (default) every feed goes out in one request: a Multicall3 eth_call
+    (one sub-call, for providers that bill JSON-RPC batches per entry), else a JSON-RPC batch.
+    use_batch=False reads each symbol on its own (and through the read cache).
+    """
+    symbols = list(symbols)
+    feed_ids = [_symbol_feed(sym)[0] for sym in symbols]
+    values = _batched_feed_values(feed_ids, debug=debug) if use_batch else [None] * len(symbols)
+
+    prices: List[Dict[str, Any]] = []
+    for sym, feed_id, pair in zip(symbols, feed_ids, values):
+        try:
+            if pair is not None:
+                prices.append(_price_result(sym, pair[0], pair[1], feed_id, debug=debug))
+            else:
+                prices.append(read_contract_price(sym, debug=debug))
+        except Exception as e:
+            if debug:
+                print(f"❌ Failed to read {sym}: {e}")
+            prices.append({"error": str(e)})
+    return prices
+
+
 def read_all_configured_prices(debug: bool = False) -> Dict[str, Any]:
     """
-    Read prices for all configured symbols from the contract.
-    Currently only BTC-FEUSD is configured.
+    Read prices for all configured symbols (SYMBOL_TO_CONTRACT_FEED) from the contract,
+    in one request (see read_contract_prices).
     
     Returns:
-        Dict with symbol -> price data mapping
+        Dict with symbol -> price data mapping ({"error": ...} for symbols that failed)
     """
-    return read_btc_feusd_price(debug=debug)
+    symbols = list(SYMBOL_TO_CONTRACT_FEED)
+    return dict(zip(symbols, read_contract_prices(symbols, debug=debug)))
 
 
 def main():
@@ -0,0 +1,116 @@
+"""
+meta_cache.py
+
+Process-wide TTL cache for the near-static Hyperliquid metadata endpoints:
+spot_meta() and meta(dex=...). Deploy and oracle code both read these every
+run / tick; caching them turns repeated /info round trips into dict lookups.
+
+Entries are keyed on (Info endpoint, dex) — dex=None means spot_meta — so
+separate Info objects pointing at the same API share one entry. Indexes
+derived from a payload (token name -> index, universe name -> position) are
+stored with it and expire/invalidate together.
+
+Exports:
+    META_CACHE_TTL_SECS
+    cached_meta(info, dex=None, ttl=META_CACHE_TTL_SECS) -> spot_meta() (dex=None) or meta(dex=dex)
+    spot_token_index(info) -> {token name (exact case): spot token index}
+    universe_index(info, dex) -> (meta, {asset name: (asset, universe index)})
+    coins_in_universe(meta, dex) -> frozenset({'BTC-FEUSD', ...}) for '<dex>:<coin>' names
+    deployed_coins(info, dex) -> coins_in_universe of the cached meta
+    invalidate(dex=None, all_dexes=False) -> drop cached entries
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional, Tuple
+
+# spot_meta / meta(dex) are near-static; reuse them for this long unless invalidated
+META_CACHE_TTL_SECS = 30.0
+
+_SPOT = None  # dex key used for spot_meta()
+
+# (endpoint, dex) -> (expires_at, payload, derived {name: value})
+_ENTRIES: Dict[Tuple[Hashable, Optional[str]], Tuple[float, Any, Dict[str, Any]]] = {}
+_LOCK = threading.Lock()
+
+
+def _endpoint(info: Any) -> Hashable:
+    return getattr(info, "base_url", id(info))
+
+
+def _entry(info: Any, dex: Optional[str], ttl: float) -> Tuple[float, Any, Dict[str, Any]]:
+    key = (_endpoint(info), dex)
+    now = time.monotonic()
+    with _LOCK:
+        hit = _ENTRIES.get(key)
+    if hit is not None and hit[0] > now:
+        return hit
+
+    payload = info.spot_meta() if dex is _SPOT else info.meta(dex=dex)
+    entry = (time.monotonic() + ttl, payload, {})
+    with _LOCK:
+        _ENTRIES[key] = entry
+    return entry
+
+
+def _derived(info: Any, dex: Optional[str], name: str, build: Callable[[Any], Any]) -> Tuple[Any, Any]:
+    """(payload, build(payload)) with the derived value memoized on the cache entry."""
+    _, payload, derived = _entry(info, dex, META_CACHE_TTL_SECS)
+    if name not in derived:
+        derived[name] = build(payload)
+    return payload, derived[name]
+
+
+def cached_meta(info: Any, dex: Optional[str] = None, ttl: float = META_CACHE_TTL_SECS) -> Dict:
+    """spot_meta() when dex is None, else meta(dex=dex); served from cache for `ttl` seconds."""
+    return _entry(info, dex, ttl)[1]
+
+
+def spot_token_index(info: Any) -> Dict[str, int]:
+    """{token name (exact case): spot token index} from spot_meta()."""
+    return _derived(
+        info, _SPOT, "token_index",
+        lambda spot: {t["name"]: int(t["index"]) for t in spot.get("tokens", []) if "name" in t and "index" in t},
+    )[1]
+
+
+def _build_universe_index(meta: Dict) -> Dict[str, tuple]:
+    index: Dict[str, tuple] = {}
+    for i, asset in enumerate(meta.get("universe", [])):
+        index.setdefault(asset.get("name"), (asset, i))  # first match wins, like a linear scan
+    return index
+
+
+def universe_index(info: Any, dex: str):
+    """(meta, {asset name: (asset, universe index)}) for a DEX, built once per cached meta."""
+    return _derived(info, dex, "universe_index", _build_universe_index)
+
+
+def coins_in_universe(meta: Dict, dex: str) -> FrozenSet[str]:
+    """Coin part of every '<dex>:<coin>' name in meta['universe'] (e.g. 'btcx:BTC-FEUSD' -> 'BTC-FEUSD')."""
+    prefix = f"{dex}:"
+    plen = len(prefix)
+    names = (a.get("name", "") for a in meta.get("universe", ()))
+    return frozenset(name[plen:] for name in names if name.startswith(prefix))
+
+
+def deployed_coins(info: Any, dex: str) -> FrozenSet[str]:
+    """Coins currently deployed on `dex`, computed once per cached meta."""
+    return _derived(info, dex, "deployed_coins", lambda meta: coins_in_universe(meta, dex))[1]
+
+
+def invalidate(dex: Optional[str] = None, all_dexes: bool = False) -> None:
+    """
+    Drop cached entries so the next read is fresh.
+    - invalidate("btcx"): that DEX's meta (e.g. after registering an asset on it)
+    - invalidate(): spot_meta
+    - invalidate(all_dexes=True): everything
+    """
+    with _LOCK:
+        if all_dexes:
+            _ENTRIES.clear()
+            return
+        for key in [k for k in _ENTRIES if k[1] == dex]:
+            del _ENTRIES[key]
@@ -0,0 +1,97 @@
+"""
+multicall.py
+
+Bundle several read-only contract calls into a single eth_call via Multicall3.
+
+Multicall3 is deployed at the same address on every EVM chain (HyperEVM included),
+so one JSON-RPC round trip can replace N sequential `eth_call`s.
+
+Exports:
+    MULTICALL3_ADDRESS
+    MulticallBatcher(w3).add(target, call_data) / .execute() -> [(success, return_data), ...]
+    encode_call(contract, fn_name, args) -> hex calldata
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, List, Sequence, Tuple
+
+from eth_abi import decode as abi_decode
+from web3 import Web3
+
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Only the entry point we use: tryAggregate(bool requireSuccess, Call[] calls) -> Result[]
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {"internalType": "bool", "name": "requireSuccess", "type": "bool"},
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call[]",
+                "name": "calls",
+                "type": "tuple[]",
+            },
+        ],
+        "name": "tryAggregate",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    }
+]
+
+# Checksumming hashes the address (keccak256); targets repeat every batch, so do it once per address
+_checksum = functools.lru_cache(maxsize=256)(Web3.to_checksum_address)
+
+# Provider-less contract object, built once: only used to ABI-encode calldata.
+_MULTICALL3 = Web3().eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+
+def encode_call(contract, fn_name: str, args: Sequence[Any] = ()) -> str:
+    """ABI-encode `fn_name(*args)` for `contract` (works on web3.py v6 and v7)."""
+    encoder = getattr(contract, "encode_abi", None) or contract.encodeABI
+    return encoder(fn_name, args=list(args))
+
+
+class MulticallBatcher:
+    """Collect (target, calldata) pairs and submit them as one Multicall3 tryAggregate eth_call."""
+
+    def __init__(self, w3: Web3):
+        self.w3 = w3
+        self._calls: List[Tuple[str, bytes]] = []
+
+    def add(self, target: str, call_data) -> int:
+        """Queue a call; returns its position in the result list."""
+        if isinstance(call_data, str):
+            call_data = bytes.fromhex(call_data[2:] if call_data.startswith("0x") else call_data)
+        self._calls.append((_checksum(target), bytes(call_data)))
+        return len(self._calls) - 1
+
+    def execute(self, require_success: bool = False) -> List[Tuple[bool, bytes]]:
+        """
+        Send all queued calls in a single eth_call.
+        Returns [(success, return_data), ...] in the order calls were added.
+        Raises if the aggregate itself fails (e.g. Multicall3 missing on the chain).
+        """
+        if not self._calls:
+            return []
+        data = encode_call(_MULTICALL3, "tryAggregate", [require_success, self._calls])
+        raw = self.w3.eth.call({"to": MULTICALL3_ADDRESS, "data": data})
+        (results,) = abi_decode(["(bool,bytes)[]"], bytes(raw))
+        self._calls = []
+        return [(bool(ok), bytes(ret)) for ok, ret in results]
@@ -8,6 +8,8 @@ from typing import Dict, Any, List, Tuple, Optional
 from hyperliquid.info import Info
 from hyperliquid.utils import constants
 
+from src.hip3 import meta_cache
+
 
 def get_api_url(network: str = "testnet", api_url_override: Optional[str] = None) -> str:
     """Resolve the API URL based on flags (custom overrides default)."""
@@ -22,9 +24,10 @@ def get_api_url(network: str = "testnet", api_url_override: Optional[str] = None
 def build_token_index_map(info: Info) -> Dict[str, Tuple[str, int]]:
     """
     Returns a dict mapping lowercased token NAME -> (exact_name, index).
-    Uses `info.spot_meta()`.
+    Uses `info.spot_meta()` (via the shared meta cache, so it costs no extra
+    round trip when the collateral lookup already read it).
     """
-    spot = info.spot_meta()
+    spot = meta_cache.cached_meta(info)
     mapping: Dict[str, Tuple[str, int]] = {}
     for t in spot.get("tokens", []):
         name = t.get("name")
@@ -54,22 +57,18 @@ def resolve_tokens(
 
     resolved: Dict[str, Dict[str, Any]] = {}
     not_found: List[str] = []
+    lookup = token_map.get
 
     for w in wanted:
-        keys_to_try = [w.lower()]
-        for a in aliases.get(w, []):
-            keys_to_try.append(a.lower())
-
-        hit = None
-        for k in keys_to_try:
-            if k in token_map:
-                exact, idx = token_map[k]
-                hit = {"exact_name": exact, "index": idx}
-                break
+        # The name itself first, then its aliases in the order given
+        entry = lookup(w.lower())
+        if entry is None:
+            entry = next(filter(None, map(lookup, (a.lower() for a in aliases.get(w, ())))), None)
 
-        if hit is None:
+        if entry is None:
             not_found.append(w)
         else:
-            resolved[w] = hit
+            exact, idx = entry
+            resolved[w] = {"exact_name": exact, "index": idx}
 
     return resolved, not_found
@@ -0,0 +1,149 @@
+"""
+backoff.py
+
+Retry pacing for signed Hyperliquid actions (register_asset, set_oracle):
+- backoff_delay / sleep_backoff: capped exponential backoff with jitter, so
+  retries from several callers spread out instead of arriving in lockstep.
+- TokenBucket: client-side rate limit shared by every signed call in the
+  process; calls go out immediately while tokens are available and only
+  wait once a burst has been used up.
+- CircuitBreaker: stop calling an endpoint that keeps failing for a while,
+  instead of spending every tick on retries that will fail too.
+- retry_call: a few quick in-process retries of an idempotent read on
+  transient errors, before the caller has to re-run the whole tick.
+
+Exports:
+    backoff_delay(attempt, base=0.2, cap=8.0) -> seconds
+    sleep_backoff(attempt, base=0.2, cap=8.0) -> seconds slept
+    TokenBucket(rate=5.0, burst=10).acquire()
+    CircuitBreaker(failure_threshold=3, recovery_seconds=30.0).allow() / .on_success() / .on_failure()
+    retry_call(fn, *args, retry_on=(...), retry_if=None, tries=3, base=0.05, cap=0.5, label="call", **kwargs)
+    SIGNED_ACTIONS  (process-wide bucket for exchange.perp_deploy_* calls)
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple, Type
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 8.0) -> float:
+    """Jittered exponential delay for retry `attempt` (0-based): uniform(base, base*3*2**attempt), capped."""
+    return min(cap, random.uniform(base, base * 3 * (2 ** attempt)))
+
+
+def sleep_backoff(attempt: int, base: float = 0.2, cap: float = 8.0) -> float:
+    """Sleep for backoff_delay(attempt, base, cap); returns the delay used (for logging)."""
+    delay = backoff_delay(attempt, base, cap)
+    time.sleep(delay)
+    return delay
+
+
+def retry_call(
+    fn: Callable[..., Any],
+    *args: Any,
+    retry_on: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError),
+    retry_if: Optional[Callable[[BaseException], bool]] = None,
+    tries: int = 3,
+    base: float = 0.05,
+    cap: float = 0.5,
+    label: str = "call",
+    **kwargs: Any,
+) -> Any:
+    """
+    fn(*args, **kwargs), retried up to `tries` times on `retry_on` with sleep_backoff(base, cap).
+    retry_if, when given, narrows that further: an error it returns False for is raised at once.
+    Each retry logs a [warn] line on stderr (so degraded providers show up); the last error is raised.
+    Only for idempotent reads: nothing here knows whether a failed write landed.
+    """
+    for attempt in range(tries):
+        try:
+            return fn(*args, **kwargs)
+        except retry_on as e:
+            if attempt + 1 >= tries or (retry_if is not None and not retry_if(e)):
+                raise
+            wait = sleep_backoff(attempt, base, cap)
+            print(f"[warn] {label} attempt {attempt + 1}/{tries} failed: {e}; retried after {wait:.2f}s", file=sys.stderr)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` banked."""
+
+    def __init__(self, rate: float = 5.0, burst: int = 10):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take `tokens`, blocking until they are available; returns the time spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class CircuitBreaker:
+    """
+    CLOSED -> (failure_threshold consecutive failures) -> OPEN -> (recovery_seconds) -> HALF_OPEN.
+    HALF_OPEN lets a single probe call through: its success closes the breaker, its failure reopens it.
+    Every caller that allow() let through must report on_success() or on_failure(); a probe that
+    never reports is given up on after another recovery_seconds.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 3, recovery_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_at: float = 0.0  # monotonic start of the HALF_OPEN probe in flight, 0 if none
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """False while OPEN or while a HALF_OPEN probe is in flight (the caller should skip the request entirely)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                if now - self._opened_at < self.recovery_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+            elif self.state == self.HALF_OPEN:
+                if self._probe_at and now - self._probe_at < self.recovery_seconds:
+                    return False
+            else:
+                return True
+            self._probe_at = now
+            return True
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_at = 0.0
+
+    def on_failure(self) -> None:
+        with self._lock:
+            self._probe_at = 0.0
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+# Shared by every signed deploy / oracle action in the process
+SIGNED_ACTIONS = TokenBucket(rate=5.0, burst=10)
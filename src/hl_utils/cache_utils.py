@@ -0,0 +1,94 @@
+"""
+cache_utils.py
+
+Tiny in-process TTL cache used to share price/FX lookups between calls that
+happen within the same few seconds (e.g. one oracle tick resolving BTC/USD and
+three stable factors).
+
+Exports:
+    ttl_cache(ttl_seconds, key=None, ttl_for=None) -> decorator (adds .cache_clear() / .cache_invalidate(*args))
+    make_key(*args, **kwargs) -> hashable key (lists/dicts frozen to tuples)
+    info_key(info, *args, **kwargs) -> key on the Info endpoint instead of the instance
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _freeze(value: Any) -> Hashable:
+    """Turn lists/tuples/sets/dicts into hashable tuples (recursively)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_freeze(v) for v in value))
+    return value
+
+
+def make_key(*args: Any, **kwargs: Any) -> Hashable:
+    """Default cache key: positional args + sorted kwargs, with containers frozen."""
+    return (_freeze(args), _freeze(kwargs))
+
+
+def info_key(info: Any, *args: Any, **kwargs: Any) -> Hashable:
+    """Key on an Info's API endpoint rather than the instance (callers often build fresh Info objects)."""
+    return (getattr(info, "base_url", id(info)), make_key(*args, **kwargs))
+
+
+def ttl_cache(
+    ttl_seconds: float,
+    key: Optional[Callable[..., Hashable]] = None,
+    ttl_for: Optional[Callable[[Any], float]] = None,
+):
+    """
+    Memoize a function for `ttl_seconds` per distinct argument set.
+    - `key` overrides how arguments map to a cache key (default: make_key).
+    - `ttl_for(value)` optionally picks the TTL per result (e.g. shorter for fallbacks).
+    - Exceptions are not cached.
+    - The wrapped function gets `.cache_clear()` for explicit invalidation, and
+      `.cache_invalidate(*args, **kwargs)` to drop only the entry for those arguments.
+    """
+    key_fn = key or make_key
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        entries: Dict[Hashable, Tuple[float, Any]] = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                k = key_fn(*args, **kwargs)
+                hash(k)
+            except TypeError:
+                return fn(*args, **kwargs)  # unhashable arguments: bypass the cache
+
+            now = time.monotonic()
+            with lock:
+                hit = entries.get(k)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+
+            value = fn(*args, **kwargs)
+            ttl = ttl_for(value) if ttl_for is not None else ttl_seconds
+            with lock:
+                entries[k] = (time.monotonic() + ttl, value)
+            return value
+
+        def cache_clear() -> None:
+            with lock:
+                entries.clear()
+
+        def cache_invalidate(*args: Any, **kwargs: Any) -> None:
+            with lock:
+                entries.pop(key_fn(*args, **kwargs), None)
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_invalidate = cache_invalidate  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
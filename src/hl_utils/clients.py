@@ -0,0 +1,60 @@
+"""
+clients.py
+
+Process-wide (address, info, exchange) clients, built once per API URL.
+
+example_utils.setup() reads the wallet config, builds Info (which fetches
+meta + spot_meta) and Exchange, and checks the account balance. Scripts that
+need those clients in several places call get_clients() instead, so that work
+and the underlying HTTP connections happen once per process.
+
+Read-only callers that only need Info share one REST-only instance per API
+URL through get_info() (no wallet, no Exchange).
+
+Exports:
+    get_clients(api_url, perp_dexs=None) -> (address, info, exchange)
+    get_info(api_url) -> Info (skip_ws=True, on the shared HTTP session)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+_CLIENTS: Dict[Hashable, Tuple[str, Any, Any]] = {}
+_INFOS: Dict[Optional[str], Any] = {}
+_LOCK = threading.Lock()
+
+
+def get_clients(api_url: Optional[str], perp_dexs: Optional[Sequence[str]] = None) -> Tuple[str, Any, Any]:
+    """Return cached (address, info, exchange) for this API URL / perp_dexs, creating them on first use."""
+    key = (api_url, tuple(perp_dexs or ()))
+    clients = _CLIENTS.get(key)
+    if clients is None:
+        with _LOCK:
+            clients = _CLIENTS.get(key)
+            if clients is None:
+                # Deferred: pulls in eth_account + the Hyperliquid SDK
+                import src.hl_utils.example_utils as example_utils
+
+                clients = example_utils.setup(
+                    base_url=api_url, skip_ws=True, perp_dexs=list(perp_dexs) if perp_dexs else None
+                )
+                _CLIENTS[key] = clients
+    return clients
+
+
+def get_info(api_url: Optional[str]) -> Any:
+    """Return the cached REST-only Info for this API URL, creating it on first use."""
+    info = _INFOS.get(api_url)
+    if info is None:
+        with _LOCK:
+            info = _INFOS.get(api_url)
+            if info is None:
+                # Deferred: the SDK is slow to import; Info() fetches meta + spot_meta on construction
+                from hyperliquid.info import Info
+                from src.hl_utils.http_session import attach_session
+
+                info = attach_session(Info(api_url, skip_ws=True))
+                _INFOS[api_url] = info
+    return info
@@ -8,6 +8,8 @@ from eth_account.signers.local import LocalAccount
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 
+from src.hl_utils.http_session import attach_session
+
 
 def setup(base_url=None, skip_ws=False, perp_dexs=None):
     config_path = os.path.join(os.path.dirname(__file__), "config.json")
@@ -20,7 +22,7 @@ def setup(base_url=None, skip_ws=False, perp_dexs=None):
     print("Running with account address:", address)
     if address != account.address:
         print("Running with agent address:", account.address)
-    info = Info(base_url, skip_ws, perp_dexs=perp_dexs)
+    info = attach_session(Info(base_url, skip_ws, perp_dexs=perp_dexs))
     user_state = info.user_state(address)
     spot_user_state = info.spot_user_state(address)
     margin_summary = user_state["marginSummary"]
@@ -29,7 +31,7 @@ def setup(base_url=None, skip_ws=False, perp_dexs=None):
         url = info.base_url.split(".", 1)[1]
         error_string = f"No accountValue:\nIf you think this is a mistake, make sure that {address} has a balance on {url}.\nIf address shown is your API wallet address, update the config to specify the address of your account, not the address of the API wallet."
         raise Exception(error_string)
-    exchange = Exchange(account, base_url, account_address=address, perp_dexs=perp_dexs)
+    exchange = attach_session(Exchange(account, base_url, account_address=address, perp_dexs=perp_dexs))
     return address, info, exchange
 
 
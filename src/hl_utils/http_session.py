@@ -0,0 +1,50 @@
+"""
+http_session.py
+
+One pooled, keep-alive HTTP session shared by every Hyperliquid client in the
+process. The SDK's Info / Exchange objects each create their own
+requests.Session; attaching this one instead lets them reuse warm TLS
+connections to the API host.
+
+Exports:
+    get_session() -> requests.Session (process-wide singleton)
+    attach_session(client) -> client (swaps client.session for the shared one)
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+from typing import TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = 4   # distinct hosts kept warm (mainnet, testnet, ...)
+POOL_MAXSIZE = 32      # concurrent connections per host (discovery + push workers + order-book polls)
+
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=1)
+def get_session() -> requests.Session:
+    """Process-wide requests.Session with a keep-alive connection pool."""
+    session = requests.Session()
+    # Same default header the SDK's API base class sets on its own session
+    session.headers.update({"Content-Type": "application/json"})
+    # max_retries=0: retries are paced by the callers (backoff.py), not replayed blindly here
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    atexit.register(session.close)
+    return session
+
+
+def attach_session(client: T) -> T:
+    """Make an SDK client (Info / Exchange) send its requests through the shared session."""
+    if hasattr(client, "session"):
+        own = client.session
+        client.session = get_session()
+        if own is not client.session:
+            own.close()
+    return client
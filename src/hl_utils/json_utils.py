@@ -0,0 +1,61 @@
+"""
+json_utils.py
+
+JSON helpers for the diagnostic scripts and hot read paths. Uses orjson when
+it is installed (much faster on large nested payloads such as spotMeta / meta
+dumps and deep l2Book replies) and falls back to the stdlib json module otherwise.
+
+Exports:
+    dumps_pretty(obj, indent=True) -> str
+    print_json(obj, indent=True) -> None
+    loads(data) -> object (bytes / str)
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def _orjson_bytes(obj: Any, indent: bool) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(obj, option=option)
+
+
+def dumps_pretty(obj: Any, indent: bool = True) -> str:
+    """Serialize `obj` like json.dumps(obj, indent=2) (or compact when indent=False)."""
+    if orjson is not None:
+        try:
+            return _orjson_bytes(obj, indent).decode()
+        except TypeError:
+            pass  # types orjson rejects: let json raise or handle them
+    return json.dumps(obj, indent=2 if indent else None)
+
+
+def print_json(obj: Any, indent: bool = True) -> None:
+    """print(json.dumps(obj, indent=2)) equivalent that skips the str round-trip with orjson."""
+    out = getattr(sys.stdout, "buffer", None)
+    if orjson is None or out is None:
+        print(dumps_pretty(obj, indent))
+        return
+    try:
+        data = _orjson_bytes(obj, indent)
+    except TypeError:
+        print(dumps_pretty(obj, indent))
+        return
+    sys.stdout.flush()  # keep ordering with earlier print() output
+    out.write(data + b"\n")
+    out.flush()
+
+
+def loads(data: Any) -> Any:
+    """json.loads that takes bytes or str; orjson-backed when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
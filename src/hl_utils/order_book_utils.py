@@ -6,8 +6,49 @@ Utility functions for reading order book data using the Info API.
 Implements robust order book reading with proper error handling and fallbacks.
 """
 
-from hyperliquid.info import Info
+import functools
+import inspect
+import threading
+from operator import itemgetter
+
 from src.hip3.hip3_config import API_URL
+from src.hl_utils.clients import get_info
+from src.hl_utils.json_utils import loads as json_loads
+
+# {"px": ..., "sz": ..., "n": ...} level -> (px, sz)
+_PX_SZ = itemgetter("px", "sz")
+
+
+@functools.lru_cache(maxsize=None)
+def _info_post(info_cls):
+    """
+    Bind the /info POST for this SDK version once, by signature, instead of a
+    per-call try/except TypeError. Current SDKs: post(path, payload); older: post(payload).
+    """
+    params = list(inspect.signature(info_cls.post).parameters)
+    if len(params) >= 3:  # (self, url_path, payload)
+        return lambda info, payload: info.post("/info", payload)
+    return lambda info, payload: info.post(payload)
+
+
+def _post_info_raw(info, payload):
+    """
+    POST /info on the Info's own session and decode the body with json_utils.loads
+    (orjson when installed): deep l2Book replies are mostly numeric strings, where
+    the stdlib decoder inside the SDK's post() dominates. Errors are raised the
+    way the SDK raises them; clients without a session use their post().
+    """
+    session = getattr(info, "session", None)
+    base_url = getattr(info, "base_url", None)
+    if session is None or base_url is None:
+        return _info_post(type(info))(info, payload)
+    response = session.post(base_url + "/info", json=payload, timeout=getattr(info, "timeout", None))
+    if response.status_code >= 400:
+        handle = getattr(info, "_handle_exception", None)
+        if handle is not None:
+            handle(response)  # SDK ClientError / ServerError
+        response.raise_for_status()
+    return json_loads(response.content)
 
 
 def read_order_book(coin, n_sig_figs=None, mantissa=None):
@@ -29,7 +70,7 @@ def read_order_book(coin, n_sig_figs=None, mantissa=None):
         }
     """
     try:
-        info = Info(API_URL, skip_ws=True)
+        info = get_info(API_URL)  # shared: Info() fetches meta + spot_meta on construction
         payload = {
             "type": "l2Book",
             "coin": coin,
@@ -39,11 +80,7 @@ def read_order_book(coin, n_sig_figs=None, mantissa=None):
         if mantissa is not None:
             payload["mantissa"] = mantissa
 
-        # Current SDKs: post(path, payload). Fallback for older SDKs: post(payload)
-        try:
-            ob = info.post("/info", payload)
-        except TypeError:
-            ob = info.post(payload)
+        ob = _post_info_raw(info, payload)
 
         return {
             "success": True, 
@@ -72,8 +109,8 @@ def get_order_book_levels(coin, n_sig_figs=None, mantissa=None):
         dict: Result with bids, asks, and metadata
         {
             "success": bool,
-            "bids": list,  # List of [price, size] tuples
-            "asks": list,  # List of [price, size] tuples
+            "bids": list,  # List of (price, size) tuples
+            "asks": list,  # List of (price, size) tuples
             "metadata": dict,
             "error": str  # Error message if failed
         }
@@ -106,9 +143,9 @@ def get_order_book_levels(coin, n_sig_figs=None, mantissa=None):
         bids_raw = levels[0] if len(levels) > 0 else []
         asks_raw = levels[1] if len(levels) > 1 else []
         
-        # Convert to [price, size] format for consistency with existing code
-        bids = [[order["px"], order["sz"]] for order in bids_raw]
-        asks = [[order["px"], order["sz"]] for order in asks_raw]
+        # Convert to (price, size) pairs; indexing ([0][0]) works as it did for lists
+        bids = list(map(_PX_SZ, bids_raw))
+        asks = list(map(_PX_SZ, asks_raw))
         
         return {
             "success": True,
@@ -147,8 +184,11 @@ def get_best_bid_ask(coin, n_sig_figs=None, mantissa=None):
             "metadata": dict,
             "error": str  # Error message if failed
         }
+
+    Only the top level of each side is parsed (the full book, as built by
+    get_order_book_levels, is never materialized).
     """
-    result = get_order_book_levels(coin, n_sig_figs, mantissa)
+    result = read_order_book(coin, n_sig_figs, mantissa)
     
     if not result["success"]:
         return {
@@ -161,8 +201,20 @@ def get_best_bid_ask(coin, n_sig_figs=None, mantissa=None):
             "error": result["error"]
         }
     
-    bids = result["bids"]
-    asks = result["asks"]
+    try:
+        levels = result["data"].get("levels", []) or []
+        bids = levels[0] if len(levels) > 0 else []
+        asks = levels[1] if len(levels) > 1 else []
+    except Exception as e:
+        return {
+            "success": False,
+            "best_bid": None,
+            "best_ask": None,
+            "spread": None,
+            "spread_percent": None,
+            "metadata": result["metadata"],
+            "error": f"Error parsing order book data: {str(e)}"
+        }
     
     if not bids or not asks:
         return {
@@ -177,12 +229,14 @@ def get_best_bid_ask(coin, n_sig_figs=None, mantissa=None):
     
     try:
         # Best bid is the highest price (first in sorted descending order)
-        best_bid_price = float(bids[0][0])
-        best_bid_size = float(bids[0][1])
+        best_bid_px, best_bid_sz = _PX_SZ(bids[0])
+        best_bid_price = float(best_bid_px)
+        best_bid_size = float(best_bid_sz)
         
         # Best ask is the lowest price (first in sorted ascending order)
-        best_ask_price = float(asks[0][0])
-        best_ask_size = float(asks[0][1])
+        best_ask_px, best_ask_sz = _PX_SZ(asks[0])
+        best_ask_price = float(best_ask_px)
+        best_ask_size = float(best_ask_sz)
         
         spread = best_ask_price - best_bid_price
         spread_percent = (spread / best_bid_price) * 100
@@ -196,7 +250,7 @@ def get_best_bid_ask(coin, n_sig_figs=None, mantissa=None):
             "metadata": result["metadata"]
         }
         
-    except (ValueError, IndexError) as e:
+    except (ValueError, IndexError, KeyError, TypeError) as e:
         return {
             "success": False,
             "best_bid": None,
@@ -208,6 +262,45 @@ def get_best_bid_ask(coin, n_sig_figs=None, mantissa=None):
         }
 
 
+def wait_for_two_sided_book(coin, timeout=10.0, base_url=API_URL, perp_dexs=None):
+    """
+    Wait for the order book to show at least one bid and one ask, via the l2Book
+    WebSocket subscription instead of polling REST.
+    
+    Args:
+        coin (str): The coin symbol (e.g., "btcx:BTC-FEUSD")
+        timeout (float): Seconds to wait before giving up
+        base_url (str): API URL (WebSocket URL is derived by the SDK)
+        perp_dexs (list, optional): Perp DEXes the Info client should know about
+    
+    Returns:
+        bool: True as soon as a two-sided book is seen, False on timeout or WS error
+    """
+    from hyperliquid.info import Info
+
+    ready = threading.Event()
+    
+    def on_book(msg):
+        levels = (msg.get("data") or {}).get("levels") or []
+        if len(levels) > 1 and levels[0] and levels[1]:
+            ready.set()
+    
+    info = None
+    try:
+        info = Info(base_url, skip_ws=False, perp_dexs=perp_dexs)
+        subscription = {"type": "l2Book", "coin": coin}
+        sub_id = info.subscribe(subscription, on_book)
+        ok = ready.wait(timeout)
+        info.unsubscribe(subscription, sub_id)
+        return ok
+    except Exception as e:
+        print(f"[warn] l2Book subscription failed for {coin}: {e}")
+        return False
+    finally:
+        if info is not None:
+            info.disconnect_websocket()
+
+
 def check_order_book_liquidity(coin, min_bids=1, min_asks=1):
     """
     Check if the order book has sufficient liquidity.
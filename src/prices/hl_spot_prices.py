@@ -11,15 +11,24 @@ Docs:
 - spotMeta (tokens & pairs): POST /info { "type": "spotMeta" }
 - Spot asset id: assetId = 10000 + spotPairIndex
 - L2 book: POST /info { "type": "l2Book", "asset": <assetId> }
+- All mids: POST /info { "type": "allMids" } (spot pairs keyed by "@<pairIndex>" or their name)
+
+spotMeta is fetched once per Info instance and reused (see _catalog_once).
 """
 
 from __future__ import annotations
-from typing import Dict, Tuple
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
 from hyperliquid.info import Info
 
 SPOT_ASSET_OFFSET = 10000
 
+# How long a fetched spot catalog is reused for the same Info instance
+CATALOG_TTL_SECS = 60.0
+_catalogs: "weakref.WeakKeyDictionary[Info, Tuple[float, Dict[str, Any]]]" = weakref.WeakKeyDictionary()
+
 
 def _build_name_to_token_index(spot_meta: Dict) -> Dict[str, int]:
     """Map token name (case-sensitive from HL) -> token index."""
@@ -32,19 +41,62 @@ def _build_name_to_token_index(spot_meta: Dict) -> Dict[str, int]:
     return out
 
 
+def _catalog_once(info: Info) -> Dict[str, Any]:
+    """
+    spotMeta plus lookup tables, fetched once per Info instance:
+      {"meta": spot_meta, "name_to_idx": {...}, "idx_to_name": {...},
+       "pairs": {(base_name, quote_name): (pair_index, mids_key)}}
+    """
+    now = time.monotonic()
+    hit = _catalogs.get(info)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    sm = info.spot_meta()
+    name_to_idx = _build_name_to_token_index(sm)
+    idx_to_name = {v: k for k, v in name_to_idx.items()}
+    pairs: Dict[Tuple[str, str], Tuple[int, str]] = {}
+    for u in sm.get("universe", []):
+        bname = idx_to_name.get(u.get("baseTokenIndex"))
+        qname = idx_to_name.get(u.get("quoteTokenIndex"))
+        pair_index = u.get("index")
+        if bname is None or qname is None or pair_index is None:
+            continue
+        # keep the first listing if a pair appears twice (matches the old linear scan)
+        pairs.setdefault((bname, qname), (int(pair_index), u.get("name") or f"@{pair_index}"))
+
+    catalog = {"meta": sm, "name_to_idx": name_to_idx, "idx_to_name": idx_to_name, "pairs": pairs}
+    _catalogs[info] = (now + CATALOG_TTL_SECS, catalog)
+    return catalog
+
+
 # add this tiny helper if you want to quickly inspect the catalog
 def debug_spot_catalog(info: Info, limit: int = 10) -> None:
     sm = info.spot_meta()
     print("TOKENS:", [t.get("name") for t in sm.get("tokens", []) if t.get("name") in ["feUSD", "USDHL", "USDT0", "FEUSD"]][:limit])
     print("UNIVERSE size:", len(sm.get("universe", [])))
 
-def get_spot_mid_any(info: Info, base: str, preferred_quotes: list[str]) -> float:
+def get_spot_mid_any(
+    info: Info,
+    base: str,
+    preferred_quotes: list[str],
+    mids: Optional[Dict[str, str]] = None,
+) -> float:
     """
     Try to get mid(base/quote) using the first available quote in preferred_quotes.
     Example: get_spot_mid_any(info, "FEUSD", ["USDT0", "USDHL"])
+
+    Mids come from a single allMids call (pass `mids` to share one across calls);
+    pairs missing from it fall back to the L2 book.
     """
+    pairs = _catalog_once(info)["pairs"]
+    if mids is None:
+        mids = info.all_mids()
     last_err = None
     for quote in preferred_quotes:
+        pair = pairs.get((base, quote))
+        if pair is not None and pair[1] in mids:
+            return float(mids[pair[1]])
         try:
             return get_spot_mid(info, base, quote)
         except Exception as e:
@@ -58,49 +110,29 @@ def list_spot_pairs_for_token(info: Info, token_name: str) -> list[tuple[str, st
     Return all spot pairs in HL Spot universe where token_name is base or quote.
     Each entry = (base_name, quote_name, pair_index).
     """
-    sm = info.spot_meta()
-    name_to_idx = {t["name"]: t["index"] for t in sm.get("tokens", [])}
-    idx_to_name = {v: k for k, v in name_to_idx.items()}
-    if token_name not in name_to_idx:
+    catalog = _catalog_once(info)
+    if token_name not in catalog["name_to_idx"]:
         raise RuntimeError(f"Token not in spot_meta tokens: {token_name}")
 
-    out = []
-    for u in sm.get("universe", []):
-        b = u.get("baseTokenIndex")
-        q = u.get("quoteTokenIndex")
-        if b is None or q is None:
-            continue
-        bname = idx_to_name.get(b)
-        qname = idx_to_name.get(q)
-        if bname is None or qname is None:
-            continue
-        if bname == token_name or qname == token_name:
-            out.append((bname, qname, int(u.get("index"))))
-    return out
+    return [
+        (bname, qname, pair_index)
+        for (bname, qname), (pair_index, _) in catalog["pairs"].items()
+        if bname == token_name or qname == token_name
+    ]
 
 
 def find_spot_pair_index(info: Info, base: str, quote: str) -> int:
     """
     Return the universe index (pair index) for BASE/QUOTE, or raise if not found.
     """
-    sm = info.spot_meta()  # {"tokens":[...], "universe":[...]}
-    name_to_idx = _build_name_to_token_index(sm)
+    catalog = _catalog_once(info)
+    name_to_idx = catalog["name_to_idx"]
     if base not in name_to_idx or quote not in name_to_idx:
         raise RuntimeError(f"Token not in spot_meta: base={base} quote={quote}")
 
-    base_idx = name_to_idx[base]
-    quote_idx = name_to_idx[quote]
-
-    # Each item in universe refers to a pair; typical fields include {"baseTokenIndex":..., "quoteTokenIndex":..., "index":...}
-    for u in sm.get("universe", []):
-        if (
-            u.get("baseTokenIndex") == base_idx
-            and u.get("quoteTokenIndex") == quote_idx
-        ):
-            pair_index = u.get("index")
-            if pair_index is None:
-                break
-            return int(pair_index)
+    pair = catalog["pairs"].get((base, quote))
+    if pair is not None:
+        return pair[0]
 
     raise RuntimeError(f"Spot pair not found: {base}/{quote}")
 
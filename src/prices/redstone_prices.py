@@ -1,8 +1,15 @@
+import atexit
 import json
 import time
 import uuid
 from typing import Dict, Any, List, Tuple, Optional
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.hl_utils.cache_utils import ttl_cache
+
+# Repeated fetches within this window reuse the previous answer
+PRICE_CACHE_TTL_SECS = 5.0
 
 REDSTONE_PRICE_ENDPOINTS: List[str] = [
     "https://api.redstone.finance/prices",                 # facade
@@ -11,15 +18,22 @@ REDSTONE_PRICE_ENDPOINTS: List[str] = [
     # You can add more mirrors here if needed
 ]
 
+_HEADERS = {
+    "Accept": "application/json,text/plain,*/*",
+    "User-Agent": "hl-hip3-deploy/1.0 (+redstone-test)",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+}
+
+# Module-wide keep-alive session: warm TLS connections are reused across calls
+_SESSION = requests.Session()
+_SESSION.headers.update(_HEADERS)
+_SESSION.mount("https://", HTTPAdapter(pool_connections=len(REDSTONE_PRICE_ENDPOINTS), pool_maxsize=8))
+atexit.register(_SESSION.close)
+
 def _http_get_json(url: str, params: Dict[str, str], timeout: float) -> Tuple[int, Any, Dict[str, str]]:
-    """HTTP GET with headers; returns (status_code, parsed_json_or_text, resp_headers)."""
-    headers = {
-        "Accept": "application/json,text/plain,*/*",
-        "User-Agent": "hl-hip3-deploy/1.0 (+redstone-test)",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-    }
-    resp = requests.get(url, params=params, headers=headers, timeout=timeout)
+    """HTTP GET with headers (pooled session); returns (status_code, parsed_json_or_text, resp_headers)."""
+    resp = _SESSION.get(url, params=params, timeout=timeout)
     try:
         return resp.status_code, resp.json(), dict(resp.headers or {})
     except Exception:
@@ -124,6 +138,7 @@ def _try_redstone_endpoint(endpoint: str, symbols: List[str], timeout: float) ->
 
     raise RuntimeError(f"No usable data from {endpoint}")
 
+@ttl_cache(PRICE_CACHE_TTL_SECS)
 def fetch_redstone_prices(
     symbols: List[str],
     *,
@@ -135,6 +150,9 @@ def fetch_redstone_prices(
     """
     Fetch latest RedStone prices with endpoint + query-shape fallbacks and exponential backoff.
     Returns {SYMBOL: {value, timestamp, provider}}.
+
+    Results are cached for PRICE_CACHE_TTL_SECS per argument set; call
+    fetch_redstone_prices.cache_clear() to force a fresh fetch.
     """
     eps = endpoints or REDSTONE_PRICE_ENDPOINTS
     attempt = 0
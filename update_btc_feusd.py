@@ -1,77 +1,130 @@
 #!/usr/bin/env python3
 """
 Simple script to update BTC-FEUSD oracle price using HyperEVM contract.
+
+Output goes through the 'update_btc_feusd' logger with lazy %-style messages.
+Status icons come from ICONS and are dropped when HL_PLAIN_LOGS=1 (journald,
+files); set HL_LOG_LEVEL=DEBUG to also get the progress banners.
 """
 
-import sys
+import logging
 import os
+import sys
+
+logger = logging.getLogger("update_btc_feusd")
+
+ICONS = {
+    "ok": "✅ ", "err": "❌ ", "warn": "⚠️  ", "info": "ℹ️  ", "search": "🔍 ", "read": "📊 ",
+    "price": "💰 ", "age": "⏰ ", "update": "🔄 ", "mapping": "📍 ",
+}
+if os.environ.get("HL_PLAIN_LOGS") == "1":
+    ICONS = dict.fromkeys(ICONS, "")
+
+
+def _setup_logging() -> None:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(os.environ.get("HL_LOG_LEVEL", "INFO").upper())
+    logger.propagate = False
+
+
+def _load_oracle_module():
+    """Import the contract oracle module on first use: web3 / eth_abi dominate cold start."""
+    from src.hip3.bootstrap import MissingDependencyError, require_contract_module
 
-# Add src to path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-try:
-    from src.hip3.hip3_update_oracle_contract import update_btc_feusd_oracle, read_btc_feusd_price
-    print("✅ Contract oracle module loaded")
-except ImportError as e:
-    print(f"❌ Import error: {e}")
-    print("Missing dependencies? Try: pip install web3 eth_utils")
-    sys.exit(1)
-
-
-def main():
-    """Update BTC-FEUSD oracle price"""
-    dex = "btcx"  # Change this to your DEX handle
-    
-    print("🔍 BTC-FEUSD Oracle Updater")
-    print("=" * 40)
-    
-    # First, read the current price from contract
-    print("📊 Reading current BTC-FEUSD price from contract...")
     try:
-        price_data = read_btc_feusd_price(debug=True)
+        oracle = require_contract_module()
+    except MissingDependencyError as e:
+        logger.error("%sMissing dependencies: %s", ICONS["err"], e)
+        return None
+    logger.debug("%sContract oracle module loaded", ICONS["ok"])
+    return oracle
+
+
+def main(dex: str = "btcx"):
+    """Update BTC-FEUSD oracle price on `dex` (your DEX handle)"""
+    if not logger.handlers:
+        _setup_logging()
+    oracle = _load_oracle_module()
+    if oracle is None:
+        return 1
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    if debug:
+        logger.debug("%sBTC-FEUSD Oracle Updater\n%s", ICONS["search"], "=" * 40)
+        # First, read the current price from contract
+        logger.debug("%sReading current BTC-FEUSD price from contract...", ICONS["read"])
+    try:
+        price_data = oracle.read_btc_feusd_price(debug=debug)
         btc_data = price_data.get("BTC-FEUSD", {})
-        
+
         if "error" in btc_data:
-            print(f"❌ Failed to read price: {btc_data['error']}")
+            logger.error("%sFailed to read price: %s", ICONS["err"], btc_data["error"])
             return 1
-        
+
         price = btc_data['price']
         age_min = btc_data['age_minutes']
-        
-        print(f"💰 Current BTC-FEUSD price: {price:,.6f}")
-        print(f"⏰ Price age: {age_min} minutes")
-        
+
+        logger.info("%sCurrent BTC-FEUSD price: %.6f", ICONS["price"], price)
+        logger.info("%sPrice age: %d minutes", ICONS["age"], age_min)
+
         if age_min > 30:
-            print("⚠️  Warning: Price is older than 30 minutes")
-        
+            logger.warning("%sWarning: Price is older than 30 minutes", ICONS["warn"])
+
+        # Heartbeat / timestamp gate before pushing (a one-shot run has no earlier reads, so the
+        # median-deviation part only bites in btc_feusd_oracle_loop.py)
+        reject = oracle.check_price_window("BTC-FEUSD", btc_data)
+        if reject:
+            logger.error("%sNot pushing: %s", ICONS["err"], reject)
+            return 1
+
     except Exception as e:
-        print(f"❌ Error reading contract price: {e}")
+        logger.error("%sError reading contract price: %s", ICONS["err"], e)
         return 1
-    
+
+    # Skip the whole push path when the posted oraclePx is already within ORACLE_MIN_BPS. HL reports
+    # no oracle push time, so the heartbeat runs off our own last push when this process made one,
+    # else off the feed write (a fresh feed write is what a push would carry anyway).
+    age_s = oracle.last_push_age_s(dex, "BTC-FEUSD")
+    if age_s is None:
+        age_s = btc_data.get("age_seconds")
+    if age_s is None:
+        logger.warning("%sFeed age unknown; deciding on the price delta alone", ICONS["warn"])
+        age_s = 0.0
+    try:
+        on_oracle = oracle.read_oracle_price(dex, "BTC-FEUSD")
+    except Exception as e:
+        logger.warning("%sCould not read the posted oracle price (%s); pushing anyway", ICONS["warn"], e)
+        on_oracle = None
+    if not oracle.should_update(on_oracle, price, age_s):
+        logger.info("%sNo update needed: oracle already at %.6f", ICONS["info"], on_oracle)
+        return 0
+
     # Now update the oracle
-    print(f"\n🔄 Updating oracle for DEX '{dex}'...")
+    logger.info("%sUpdating oracle for DEX '%s'...", ICONS["update"], dex)
     try:
-        result = update_btc_feusd_oracle(dex, debug=True)
-        
+        # Reuse the read above (price + admin, one Multicall3 call) instead of reading again
+        result = oracle.update_btc_feusd_oracle(dex, debug=debug, price_info=btc_data)
+
         if result["status"] == "ok":
-            print("✅ Oracle update successful!")
-            print(f"💰 Updated price: {result['price']:,.6f} FEUSD per BTC")
-            print(f"📍 Mapping: {result['mapping']}")
+            logger.info("%sOracle update successful!", ICONS["ok"])
+            logger.info("%sUpdated price: %.6f FEUSD per BTC", ICONS["price"], result["price"])
+            logger.info("%sMapping: %s", ICONS["mapping"], result["mapping"])
         elif result["status"] == "noop":
-            print(f"ℹ️  No update needed: {result['reason']}")
+            logger.info("%sNo update needed: %s", ICONS["info"], result["reason"])
         else:
-            print(f"❌ Oracle update failed: {result['reason']}")
+            logger.error("%sOracle update failed: %s", ICONS["err"], result.get("reason") or result.get("raw_result"))
             return 1
-            
+
     except Exception as e:
-        print(f"❌ Error updating oracle: {e}")
+        logger.error("%sError updating oracle: %s", ICONS["err"], e)
         return 1
-    
-    print("\n✅ BTC-FEUSD oracle update completed!")
+
+    logger.info("%sBTC-FEUSD oracle update completed!", ICONS["ok"])
     return 0
 
 
 if __name__ == "__main__":
     exit_code = main()
     sys.exit(exit_code)
-